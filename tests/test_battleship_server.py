@@ -0,0 +1,69 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import zenpo
+
+# A client that joins properly: 10x10 grid, the standard fleet, no match name
+JOIN = zenpo.net_pack(zenpo.NET_JOIN, bytes([10, len(zenpo.BATTLESHIP_FLEET), *zenpo.BATTLESHIP_FLEET]))
+
+class MalformedFrames(unittest.TestCase):
+    # zenpo serve can listen on 0.0.0.0, so bad input must get an ERROR
+    # frame and a closed connection, never a crash in the handler
+    def exchange(self, *frames):
+        async def run():
+            server = await asyncio.start_server(zenpo.BattleshipServer().handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            loop = asyncio.get_running_loop()
+            errors = []
+            loop.set_exception_handler(lambda loop, context: errors.append(context))
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            for frame in frames:
+                writer.write(frame)
+            received = []
+            try:
+                while True:
+                    received.append(await asyncio.wait_for(zenpo.net_read(reader), 2))
+            except asyncio.IncompleteReadError:
+                pass
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return received, errors
+        return asyncio.run(run())
+
+    def assert_rejected(self, *frames):
+        received, errors = self.exchange(*frames)
+        self.assertEqual(errors, [])
+        self.assertEqual(received[-1][0], zenpo.NET_ERROR)
+
+    def test_empty_frame(self):
+        self.assert_rejected(b"\x00\x00")
+
+    def test_short_join(self):
+        self.assert_rejected(zenpo.net_pack(zenpo.NET_JOIN, b"\x0a"))
+        self.assert_rejected(zenpo.net_pack(zenpo.NET_JOIN, bytes([10, 5, 5])))
+
+    def test_zero_length_ship(self):
+        self.assert_rejected(zenpo.net_pack(zenpo.NET_JOIN, bytes([10, 2, 3, 0])))
+
+    def test_fleet_that_does_not_fit(self):
+        self.assert_rejected(zenpo.net_pack(zenpo.NET_JOIN, bytes([2, 1, 5])))
+
+    def test_oversized_join(self):
+        # Would keep the event loop busy for minutes if the server placed it
+        self.assert_rejected(zenpo.net_pack(zenpo.NET_JOIN, bytes([255, 250, *[2]*250])))
+        self.assert_rejected(zenpo.net_pack(zenpo.NET_JOIN, bytes([27, 1, 2])))
+        self.assert_rejected(zenpo.net_pack(zenpo.NET_JOIN, bytes([10, 17, *[1]*17])))
+        self.assert_rejected(zenpo.net_pack(zenpo.NET_JOIN, bytes([6, 3, 5, 5, 5])))
+
+    def test_truncated_fire(self):
+        self.assert_rejected(JOIN, zenpo.net_pack(zenpo.NET_FIRE, b"\x01\x00\x03"))
+
+    def test_bad_placement(self):
+        self.assert_rejected(JOIN, zenpo.net_pack(zenpo.NET_PLACE, b"\x00\x00\x01"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import zenpo
+
+GIT_ENV = {"GIT_AUTHOR_NAME": "test", "GIT_AUTHOR_EMAIL": "test@example.com",
+           "GIT_COMMITTER_NAME": "test", "GIT_COMMITTER_EMAIL": "test@example.com"}
+
+def git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, env=dict(os.environ, **GIT_ENV))
+
+class RefreshAgainstBareRepo(unittest.TestCase):
+    # A bare "upstream", a dev clone that pushes to it, and the installed
+    # clone that refresh_package() updates; pip is replaced by a stub that
+    # counts installs
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        saved = os.environ.get("ZENPO_CACHE_DIR")
+        os.environ["ZENPO_CACHE_DIR"] = os.path.join(self.root, "cache")
+        self.addCleanup(lambda: os.environ.pop("ZENPO_CACHE_DIR") if saved is None
+                        else os.environ.__setitem__("ZENPO_CACHE_DIR", saved))
+
+        self.upstream = os.path.join(self.root, "upstream.git")
+        self.dev = os.path.join(self.root, "dev")
+        self.pkg = os.path.join(self.root, "pkg")
+        git(self.root, "init", "--bare", "-q", self.upstream)
+        git(self.root, "clone", "-q", self.upstream, self.dev)
+        self.commit({"setup.py": "# v1\n", "requirements.txt": "colorama\n", "zenpo.py": "# v1\n"})
+        git(self.root, "clone", "-q", self.upstream, self.pkg)
+
+        self.log = os.path.join(self.root, "installs.log")
+        self.install_cmd = [sys.executable, "-c", f"open({self.log!r}, 'a').write('install\\n')"]
+
+    def commit(self, files):
+        for name, text in files.items():
+            with open(os.path.join(self.dev, name), "w") as f:
+                f.write(text)
+        git(self.dev, "add", *files)
+        git(self.dev, "commit", "-q", "-m", "update")
+        git(self.dev, "push", "-q", "origin", "HEAD")
+
+    def refresh(self):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            timings = zenpo.refresh_package(self.pkg, self.install_cmd)
+        self.assertNotIn("Failed", out.getvalue())
+        return timings
+
+    def installs(self):
+        if not os.path.exists(self.log):
+            return 0
+        with open(self.log) as f:
+            return len(f.readlines())
+
+    def test_scenarios(self):
+        # First run installs
+        timings = self.refresh()
+        self.assertIn("install", timings)
+        self.assertEqual(self.installs(), 1)
+
+        # Nothing new upstream: stop after comparing
+        timings = self.refresh()
+        self.assertNotIn("pull", timings)
+        self.assertNotIn("install", timings)
+        self.assertEqual(self.installs(), 1)
+
+        # A code-only change is pulled without reinstalling
+        self.commit({"zenpo.py": "# v2\n"})
+        timings = self.refresh()
+        self.assertIn("pull", timings)
+        self.assertNotIn("install", timings)
+        self.assertEqual(self.installs(), 1)
+        with open(os.path.join(self.pkg, "zenpo.py")) as f:
+            self.assertEqual(f.read(), "# v2\n")
+
+        # Changing setup.py reinstalls
+        self.commit({"setup.py": "# v2\n"})
+        timings = self.refresh()
+        self.assertIn("install", timings)
+        self.assertEqual(self.installs(), 2)
+
+if __name__ == "__main__":
+    unittest.main()
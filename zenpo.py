@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 import argparse
+import hashlib
+import json
+import math
 import subprocess
 import sys
 import os
-import pygame
+import threading
 import random
-from pyfiglet import Figlet
+import time
+from collections import OrderedDict, deque
 from colorama import init, Fore, Style
 
 init(autoreset=True)
@@ -14,395 +18,3025 @@ VERSION = "2.0.0"
 CREATOR = "Zenpo"
 REPO = "https://github.com/ZC-RS/zenpo"
 
-def ascii_banner(text, colour=Fore.GREEN):
-    f = Figlet(font='slant')
-    return colour + f.renderText(text)
+# -------------------- Cache --------------------
+def cache_dir():
+    path = os.environ.get("ZENPO_CACHE_DIR")
+    if not path:
+        base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        path = os.path.join(base, "zenpo")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def load_cache_json(name, default):
+    try:
+        with open(os.path.join(cache_dir(), name), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def save_cache_json(name, data):
+    # Write to a temp file first so a crash never leaves half a cache behind
+    try:
+        path = os.path.join(cache_dir(), name)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+# -------------------- Banner --------------------
+BANNER_CACHE_FILE = "banners.json"
+BANNER_CACHE_SIZE = 32
+_banner_memory = {}
+_banner_disk = None
+_figlet_version = None
+
+def pyfiglet_version():
+    global _figlet_version
+    if _figlet_version is None:
+        # Read version.py straight off disk; importing pyfiglet (or
+        # importlib.metadata) would cost more than the render we're skipping
+        try:
+            import importlib.util
+            spec = importlib.util.find_spec("pyfiglet")
+            with open(os.path.join(spec.submodule_search_locations[0], "version.py"), encoding="utf-8") as f:
+                _figlet_version = f.read().split("=", 1)[1].strip().strip("'\"")
+        except Exception:
+            import pyfiglet
+            _figlet_version = getattr(pyfiglet, "__version__", "unknown")
+    return _figlet_version
+
+def ascii_banner(text, colour=Fore.GREEN, font="slant", width=80):
+    global _banner_disk
+    ver = pyfiglet_version()
+    key = f"{font}|{width}|{ver}|{text}"
+    if key not in _banner_memory:
+        if _banner_disk is None:
+            _banner_disk = load_cache_json(BANNER_CACHE_FILE, {})
+        if key in _banner_disk:
+            _banner_memory[key] = _banner_disk[key]
+        else:
+            from pyfiglet import Figlet
+            _banner_memory[key] = Figlet(font=font, width=width).renderText(text)
+            # Drop entries from other pyfiglet versions, keep the newest few
+            entries = [(k, v) for k, v in _banner_disk.items() if k.split("|")[2] == ver]
+            entries.append((key, _banner_memory[key]))
+            _banner_disk = dict(entries[-BANNER_CACHE_SIZE:])
+            save_cache_json(BANNER_CACHE_FILE, _banner_disk)
+    return colour + _banner_memory[key]
 
 # -------------------- FULL GAMES --------------------
+# Every game is split in two: a headless engine class holding state and rules
+# (reset(seed) / step(action) / observe(), own random.Random, no pygame) and a
+# pygame front-end that only turns input into actions and draws observe().
+# step() returns (reward, done) so bulk runs don't pay for observe() each tick.
+
+class TextCache:
+    # LRU cache of rendered text surfaces shared by every game, keyed by
+    # (font, text, colour, antialias). Scores, counts and tile numbers repeat
+    # constantly, so most renders become a dict lookup.
+    def __init__(self, size=512):
+        self.size = size
+        self.surfaces = OrderedDict()
+        self.hits = self.misses = 0
+
+    def render(self, font, text, colour, antialias=True):
+        key = (font, text, colour, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = self.surfaces[key] = font.render(text, antialias, colour)
+        if len(self.surfaces) > self.size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        # Fonts die with pygame.quit(), so drop their surfaces too
+        self.surfaces.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.surfaces),
+                "hit_rate": self.hits/total if total else 0.0}
+
+TEXT_CACHE = TextCache()
+
+def quit_pygame(pygame):
+    # Every pygame front-end ends here, so no cached surface outlives its font
+    TEXT_CACHE.clear()
+    pygame.quit()
+
+class EventRenderer:
+    # Turn-based front-ends draw into the screen surface only when something
+    # changes and mark what they touched with dirty(). In event mode the loop
+    # sleeps in pygame.event.wait() and present() pushes just the dirty rects;
+    # with event_driven=False it's the old tick-at-30-FPS, flip-everything loop.
+    def __init__(self, pygame, screen, event_driven=True, fps=30):
+        self.pygame, self.screen = pygame, screen
+        self.event_driven, self.fps = event_driven, fps
+        self.clock = pygame.time.Clock()
+        self.rects = []
+
+    def events(self):
+        if self.event_driven:
+            return [self.pygame.event.wait()] + self.pygame.event.get()
+        self.clock.tick(self.fps)
+        return self.pygame.event.get()
+
+    def dirty(self, rect):
+        self.rects.append(self.pygame.Rect(rect))
+
+    def present(self):
+        if not self.event_driven:
+            self.pygame.display.flip()
+        elif self.rects:
+            self.pygame.display.update(self.rects)
+        self.rects = []
+
+class FixedStepLoop:
+    # Real-time front-ends sample input every frame (up to `fps`) but advance
+    # the game at a fixed `hz`, so speed no longer depends on frame rate.
+    # Inputs wait in a small queue and steps() says how many fixed updates
+    # are due; alpha is the fraction of the next step already elapsed, for
+    # front-ends that interpolate. After a stall at most `catch_up` steps run.
+    def __init__(self, pygame, hz, fps=60, buffer=3, distinct=False, catch_up=5):
+        self.pygame, self.fps = pygame, fps
+        self.step_time = 1/hz
+        self.buffer, self.distinct, self.catch_up = buffer, distinct, catch_up
+        # The terminal backend paces itself and passes pygame=None
+        self.clock = pygame.time.Clock() if pygame else None
+        self.inputs = deque()
+        self.pending = 0.0
+        self.last = time.perf_counter()
+
+    def events(self):
+        self.clock.tick(self.fps)
+        return self.pygame.event.get()
+
+    def push(self, action):
+        # Full queue drops the newest input; distinct drops repeats
+        if len(self.inputs) < self.buffer and not (self.distinct and self.inputs and self.inputs[-1] == action):
+            self.inputs.append(action)
+
+    def pop(self):
+        return self.inputs.popleft() if self.inputs else None
+
+    def drain(self):
+        inputs = list(self.inputs)
+        self.inputs.clear()
+        return inputs
+
+    def steps(self):
+        now = time.perf_counter()
+        self.pending = min(self.pending + now - self.last, self.catch_up*self.step_time)
+        self.last = now
+        n = int(self.pending / self.step_time)
+        self.pending -= n*self.step_time
+        return n
+
+    @property
+    def alpha(self):
+        return self.pending / self.step_time
+
+# -------------------- Frame Profiler --------------------
+PROFILE_PATH = None  # set by zenpo --profile
+HUD_FRAMES = 120
+
+class NullProfiler:
+    # Used when profiling is off: every hook is an empty call
+    def begin(self): pass
+    def mark(self, phase): pass
+    def end(self): pass
+    def hud(self, screen, renderer=None): pass
+    def export(self): pass
+
+class FrameProfiler:
+    # Splits each frame into phases (events, update, render) with
+    # perf_counter marks. Sleeping in clock.tick()/event.wait() happens
+    # before begin(), so frame times are work only. hud() draws FPS and
+    # p50/p99 frame time over the last HUD_FRAMES frames; export() writes
+    # every frame as CSV or as Chrome trace JSON (chrome://tracing, Perfetto).
+    def __init__(self, pygame, game, path):
+        self.pygame, self.game, self.path = pygame, game, path
+        self.font = pygame.font.SysFont(None, 20)
+        self.frames = []  # (start, [(phase, start, end), ...])
+        self.start = self.last = 0.0
+        self.phases = []
+
+    def begin(self):
+        self.start = self.last = time.perf_counter()
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, self.last, now))
+        self.last = now
+
+    def end(self):
+        self.frames.append((self.start, self.phases))
+
+    def stats(self):
+        recent = self.frames[-HUD_FRAMES:]
+        if len(recent) < 2:
+            return 0.0, 0.0, 0.0
+        times = sorted(phases[-1][2] - start for start, phases in recent if phases)
+        fps = (len(recent)-1) / max(recent[-1][0] - recent[0][0], 1e-9)
+        return fps, times[len(times)//2], times[min(len(times)-1, int(len(times)*0.99))]
+
+    def hud(self, screen, renderer=None):
+        fps, p50, p99 = self.stats()
+        text = self.font.render(f"{fps:.0f} fps  p50 {p50*1000:.2f}  p99 {p99*1000:.2f} ms", True, (255,255,0))
+        rect = self.pygame.Rect(0, 0, text.get_width()+8, text.get_height()+4)
+        rect.topright = (screen.get_width(), 0)
+        screen.fill((0,0,0), rect)
+        screen.blit(text, (rect.x+4, rect.y+2))
+        if renderer:
+            renderer.dirty(rect)
+
+    def export(self):
+        base, ext = os.path.splitext(self.path)
+        path = f"{base}-{self.game}{ext or '.json'}"
+        origin = self.frames[0][0] if self.frames else 0.0
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            if ext.lower() == ".csv":
+                f.write("frame,start_ms,events_ms,update_ms,render_ms,total_ms\n")
+                for n, (start, phases) in enumerate(self.frames):
+                    spent = {"events": 0.0, "update": 0.0, "render": 0.0}
+                    for phase, a, b in phases:
+                        spent[phase] = spent.get(phase, 0.0) + (b - a)*1000
+                    total = (phases[-1][2] - start)*1000 if phases else 0.0
+                    f.write(f"{n},{(start-origin)*1000:.3f},{spent['events']:.3f},{spent['update']:.3f},{spent['render']:.3f},{total:.3f}\n")
+            else:
+                events = []
+                for n, (start, phases) in enumerate(self.frames):
+                    if not phases:
+                        continue
+                    events.append({"name": "frame", "ph": "X", "pid": 1, "tid": 1, "cat": self.game,
+                                   "ts": (start-origin)*1e6, "dur": (phases[-1][2]-start)*1e6, "args": {"frame": n}})
+                    events += [{"name": phase, "ph": "X", "pid": 1, "tid": 1, "cat": self.game,
+                                "ts": (a-origin)*1e6, "dur": (b-a)*1e6} for phase, a, b in phases]
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        print(f"Frame trace for {self.game} written to {path}")
+
+def make_profiler(pygame, game, path=None):
+    path = path or PROFILE_PATH
+    return FrameProfiler(pygame, game, path) if path else NullProfiler()
 
 # -------------------- Snake --------------------
-def snake_game():
+SNAKE_DIRECTIONS = {"up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0)}
+SNAKE_HZ = 10
+
+class SnakeGame:
+    # Cells are flat indices (y*width + x). The body is a deque, `occupied` a
+    # bytearray bitmap, and `free` a list of empty cells with `free_pos` giving
+    # each cell's slot in it, so moving, colliding, growing and spawning food
+    # are all O(1) no matter how long the snake gets.
+    def __init__(self, width=30, height=20, seed=None):
+        self.width, self.height = width, height
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        size = self.width * self.height
+        self.occupied = bytearray(size)
+        self.free = list(range(size))
+        self.free_pos = list(range(size))
+        self.body = deque()
+        self.add_cell((self.height//2) * self.width + self.width//2)
+        self.direction = (0, 0)
+        self.food = self.spawn_food()
+        self.score = 0
+        self.ticks = 0
+        self.done = False
+        return self.observe()
+
+    def add_cell(self, i):
+        # Swap-remove i from the free list
+        last = self.free.pop()
+        if last != i:
+            slot = self.free_pos[i]
+            self.free[slot] = last
+            self.free_pos[last] = slot
+        self.occupied[i] = 1
+        self.body.appendleft(i)
+
+    def drop_tail(self):
+        i = self.body.pop()
+        self.occupied[i] = 0
+        self.free_pos[i] = len(self.free)
+        self.free.append(i)
+
+    def spawn_food(self):
+        if not self.free:
+            return None
+        return self.free[self.rng.randrange(len(self.free))]
+
+    def step(self, action=None):
+        if self.done:
+            return 0, True
+        self.ticks += 1
+        if action in SNAKE_DIRECTIONS:
+            dx, dy = SNAKE_DIRECTIONS[action]
+            if self.direction != (-dx, -dy):
+                self.direction = (dx, dy)
+        if self.direction == (0, 0):
+            return 0, False
+
+        dx, dy = self.direction
+        y, x = divmod(self.body[0], self.width)
+        x, y = x+dx, y+dy
+        new_head = y*self.width + x
+        if not (0 <= x < self.width and 0 <= y < self.height) or self.occupied[new_head]:
+            self.done = True
+            return 0, True
+        self.add_cell(new_head)
+        if new_head == self.food:
+            self.score += 1
+            self.food = self.spawn_food()
+            # Board completely filled: nothing left to eat
+            if self.food is None:
+                self.done = True
+            return 1, self.done
+        self.drop_tail()
+        return 0, False
+
+    def cell(self, i):
+        return (i % self.width, i // self.width)
+
+    def observe(self):
+        return {"snake": [self.cell(i) for i in self.body],
+                "food": None if self.food is None else self.cell(self.food),
+                "direction": self.direction, "score": self.score, "ticks": self.ticks, "done": self.done}
+
+def draw_snake(pygame, screen, font, game, block):
+    w = game.width
+    screen.fill((0,0,0))
+    for i in game.body: pygame.draw.rect(screen,(0,255,0), ((i % w)*block, (i // w)*block, block, block))
+    if game.food is not None:
+        pygame.draw.rect(screen,(255,0,0), ((game.food % w)*block, (game.food // w)*block, block, block))
+    score_text = TEXT_CACHE.render(font, f"Score: {game.score}", (255,255,255))
+    screen.blit(score_text, (10,10))
+
+def snake_game(seed=None, width=30, height=20, profile=None):
+    import pygame
     pygame.init()
-    WIDTH, HEIGHT = 600, 400
+    # Shrink cells so big boards (e.g. 500x500) still fit on screen
+    block = max(1, min(20, 1000//width, 800//height))
+    WIDTH, HEIGHT = width*block, height*block
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Snake")
-    clock = pygame.time.Clock()
+    # One queued turn per step, so quick turns (up then left) both land
+    loop = FixedStepLoop(pygame, SNAKE_HZ, distinct=True)
+    prof = make_profiler(pygame, "snake", profile)
 
-    block = 20
-    snake = [(WIDTH//2, HEIGHT//2)]
-    direction = (0, 0)
-    food = (random.randrange(0, WIDTH, block), random.randrange(0, HEIGHT, block))
-    score = 0
+    rec = Recorder("snake", seed, width=width, height=height)
+    game = rec.game
     font = pygame.font.SysFont(None, 36)
+    keys = {pygame.K_UP: "up", pygame.K_DOWN: "down", pygame.K_LEFT: "left", pygame.K_RIGHT: "right"}
     running = True
+    done = False
+    draw_snake(pygame, screen, font, game, block)
+    pygame.display.flip()
 
     while running:
-        clock.tick(10)
-        for event in pygame.event.get():
+        events = loop.events()
+        prof.begin()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP and direction != (0, block): direction = (0, -block)
-                if event.key == pygame.K_DOWN and direction != (0, -block): direction = (0, block)
-                if event.key == pygame.K_LEFT and direction != (block, 0): direction = (-block, 0)
-                if event.key == pygame.K_RIGHT and direction != (-block, 0): direction = (block, 0)
-
-        if direction != (0,0):
-            new_head = (snake[0][0]+direction[0], snake[0][1]+direction[1])
-            if new_head in snake or not (0 <= new_head[0] < WIDTH and 0 <= new_head[1] < HEIGHT):
+            elif event.type == pygame.KEYDOWN and event.key in keys:
+                loop.push(keys[event.key])
+        prof.mark("events")
+
+        steps = loop.steps()
+        for _ in range(steps):
+            done = rec.step(loop.pop())[1]
+            if done:
                 break
-            snake.insert(0,new_head)
-            if new_head == food:
-                food = (random.randrange(0, WIDTH, block), random.randrange(0, HEIGHT, block))
-                score += 1
-            else:
-                snake.pop()
+        prof.mark("update")
+        if done:
+            break
 
-        screen.fill((0,0,0))
-        for s in snake: pygame.draw.rect(screen,(0,255,0), (*s, block, block))
-        pygame.draw.rect(screen,(255,0,0), (*food, block, block))
-        score_text = font.render(f"Score: {score}", True, (255,255,255))
-        screen.blit(score_text, (10,10))
-        pygame.display.flip()
+        # The picture only changes on a step
+        if steps:
+            draw_snake(pygame, screen, font, game, block)
+            prof.hud(screen)
+            pygame.display.flip()
+        prof.mark("render")
+        prof.end()
 
-    pygame.quit()
+    rec.save()
+    prof.export()
+    quit_pygame(pygame)
 
 # -------------------- Battleship --------------------
-def battleship_game():
+BATTLESHIP_FLEET = (5, 4, 3, 3, 2)
+# Shot board states used by the AI
+SEA_UNKNOWN, SEA_MISS, SEA_HIT, SEA_SUNK = 0, 1, 2, 3
+# How much more a placement counts for each unsunk hit it covers
+BATTLESHIP_HIT_WEIGHT = 50
+
+def ship_placements(grid_size, length, blocked=()):
+    # Every straight run of `length` cells that avoids `blocked`
+    for horizontal in (True, False):
+        for a in range(grid_size):
+            for b in range(grid_size - length + 1):
+                cells = [(b+k, a) if horizontal else (a, b+k) for k in range(length)]
+                if not any(c in blocked for c in cells):
+                    yield cells
+
+def random_fleet(grid_size, fleet, rng):
+    ships, taken = [], set()
+    for length in sorted(fleet, reverse=True):
+        options = list(ship_placements(grid_size, length, taken))
+        if not options:
+            raise ValueError(f"Fleet {tuple(fleet)} doesn't fit on a {grid_size}x{grid_size} grid")
+        ship = rng.choice(options)
+        ships.append(ship)
+        taken.update(ship)
+    return ships
+
+class BattleshipAI:
+    # Probability-density targeting: count, for every cell, how many legal
+    # placements of the ships still afloat cover it (placements through
+    # unsunk hits count much more) and fire at the densest unknown cell.
+    # Uses NumPy when it's installed, plain lists otherwise.
+    def __init__(self, grid_size=10, fleet=BATTLESHIP_FLEET, rng=None):
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        self.np = numpy
+        self.grid_size = grid_size
+        self.remaining = list(fleet)
+        self.rng = rng or random.Random()
+        if numpy is not None:
+            self.sea = numpy.zeros((grid_size, grid_size), dtype=numpy.int8)
+        else:
+            self.sea = [[SEA_UNKNOWN]*grid_size for _ in range(grid_size)]
+
+    def record(self, cell, result, sunk_cells=None):
+        x, y = cell
+        self.sea[y][x] = SEA_MISS if result == "miss" else SEA_HIT
+        if result == "sunk":
+            for sx, sy in sunk_cells:
+                self.sea[sy][sx] = SEA_SUNK
+            self.remaining.remove(len(sunk_cells))
+
+    def density(self):
+        if self.np is None:
+            return self.density_lists()
+        np = self.np
+        sea, n = self.sea, self.grid_size
+        blocked = ((sea == SEA_MISS) | (sea == SEA_SUNK)).astype(np.int32)
+        hits = (sea == SEA_HIT).astype(np.int32)
+        density = np.zeros((n, n), dtype=np.int64)
+        for length in set(self.remaining):
+            if length > n:
+                continue
+            copies = self.remaining.count(length)
+            for flip in (False, True):
+                b, h = (blocked.T, hits.T) if flip else (blocked, hits)
+                # Sliding-window sums along rows via cumulative sums
+                cb = np.pad(np.cumsum(b, axis=1), ((0, 0), (1, 0)))
+                ch = np.pad(np.cumsum(h, axis=1), ((0, 0), (1, 0)))
+                clear = (cb[:, length:] - cb[:, :-length]) == 0
+                weight = clear * (1 + BATTLESHIP_HIT_WEIGHT*(ch[:, length:] - ch[:, :-length])) * copies
+                cover = np.zeros((n, n), dtype=np.int64)
+                for k in range(length):
+                    cover[:, k:k+n-length+1] += weight
+                density += cover.T if flip else cover
+        density[sea != SEA_UNKNOWN] = 0
+        return density
+
+    def density_lists(self):
+        sea, n = self.sea, self.grid_size
+        density = [[0]*n for _ in range(n)]
+        for length in set(self.remaining):
+            copies = self.remaining.count(length)
+            for flip in (False, True):
+                for a in range(n):
+                    line = [sea[b][a] if flip else sea[a][b] for b in range(n)]
+                    for start in range(n - length + 1):
+                        window = line[start:start+length]
+                        if SEA_MISS in window or SEA_SUNK in window:
+                            continue
+                        weight = (1 + BATTLESHIP_HIT_WEIGHT*window.count(SEA_HIT)) * copies
+                        for b in range(start, start+length):
+                            if flip: density[b][a] += weight
+                            else: density[a][b] += weight
+        for y in range(n):
+            for x in range(n):
+                if sea[y][x] != SEA_UNKNOWN:
+                    density[y][x] = 0
+        return density
+
+    def next_shot(self):
+        density = self.density()
+        n = self.grid_size
+        if self.np is not None:
+            best = density.max()
+            cells = self.np.argwhere(density == best) if best > 0 else self.np.argwhere(self.sea == SEA_UNKNOWN)
+            y, x = cells[self.rng.randrange(len(cells))]
+            return int(x), int(y)
+        best = max(max(row) for row in density)
+        cells = [(x, y) for y in range(n) for x in range(n)
+                 if (density[y][x] == best if best > 0 else self.sea[y][x] == SEA_UNKNOWN)]
+        return self.rng.choice(cells)
+
+class BattleshipGame:
+    # mode "ai": step() is the player's shot, the AI answers straight away.
+    # mode "friend": step() is a shot by whoever's turn it is.
+    # Each player gets a real fleet of straight, non-overlapping ships;
+    # placed=False leaves both fleets empty for set_fleet().
+    def __init__(self, grid_size=10, mode="ai", fleet=BATTLESHIP_FLEET, seed=None, placed=True):
+        self.grid_size, self.mode, self.fleet, self.placed = grid_size, mode, tuple(fleet), placed
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.ships = [random_fleet(self.grid_size, self.fleet, self.rng) if self.placed else [] for _ in range(2)]
+        # cell -> ship index, and hits left per ship, for each player's fleet
+        self.ship_at = [{c: i for i, ship in enumerate(ships) for c in ship} for ships in self.ships]
+        self.afloat = [[len(ship) for ship in ships] for ships in self.ships]
+        self.hits = [[], []]
+        self.misses = [[], []]
+        self.shots = [set(), set()]
+        self.sunk = [0, 0]
+        self.turn = 0
+        self.winner = None
+        self.last_result = None
+        self.changed = []
+        self.ai = BattleshipAI(self.grid_size, self.fleet, self.rng) if self.mode == "ai" else None
+        return self.observe()
+
+    def set_fleet(self, player, ships):
+        # Swap a player's random fleet for their own placement (before play)
+        n, taken = self.grid_size, set()
+        if sorted(len(ship) for ship in ships) != sorted(self.fleet):
+            raise ValueError(f"Fleet must be ships of length {self.fleet}")
+        for ship in ships:
+            x, y = ship[0]
+            if (ship not in ([(x+k, y) for k in range(len(ship))], [(x, y+k) for k in range(len(ship))])
+                    or not all(0 <= a < n and 0 <= b < n for a, b in ship) or taken.intersection(ship)):
+                raise ValueError(f"Bad ship placement {ship}")
+            taken.update(ship)
+        self.ships[player] = ships
+        self.ship_at[player] = {c: i for i, ship in enumerate(ships) for c in ship}
+        self.afloat[player] = [len(ship) for ship in ships]
+
+    def fire(self, player, cell):
+        # Returns "miss", "hit", "sunk" or "repeat"
+        if cell in self.shots[player]:
+            return "repeat"
+        self.shots[player].add(cell)
+        enemy = 1 - player
+        ship = self.ship_at[enemy].get(cell)
+        if ship is None:
+            self.misses[player].append(cell)
+            return "miss"
+        self.hits[player].append(cell)
+        self.afloat[enemy][ship] -= 1
+        if self.afloat[enemy][ship]:
+            return "hit"
+        self.sunk[player] += 1
+        if self.sunk[player] == len(self.fleet) and self.winner is None:
+            self.winner = player
+        return "sunk"
+
+    def step(self, action):
+        if self.winner is not None:
+            return 0, True
+        x, y = action
+        if not (0 <= x < self.grid_size and 0 <= y < self.grid_size):
+            return 0, False
+        player = self.turn
+        result = self.last_result = self.fire(player, (x, y))
+        # (player, cell, result) for every shot this step, for redraws
+        self.changed = []
+        if result == "repeat":
+            return 0, False
+        self.changed.append((player, (x, y), result))
+        if self.mode == "ai":
+            if self.winner is None:
+                shot = self.ai.next_shot()
+                ai_result = self.fire(1, shot)
+                self.changed.append((1, shot, ai_result))
+                ship = self.ship_at[0].get(shot)
+                self.ai.record(shot, ai_result, self.ships[0][ship] if ai_result == "sunk" else None)
+        else:
+            self.turn = 1 - player
+        return int(result != "miss"), self.winner is not None
+
+    def observe(self):
+        return {"hits": [list(h) for h in self.hits], "misses": [list(m) for m in self.misses],
+                "sunk": list(self.sunk), "turn": self.turn, "winner": self.winner,
+                "done": self.winner is not None}
+
+def draw_battleship_cell(pygame, screen, game, cell, i, j):
+    # Player 0's hits are green, player 1's red (drawn on top), player 0's
+    # misses a grey dot
+    rect = pygame.Rect(i*cell, j*cell, cell, cell)
+    pygame.draw.rect(screen,(0,0,64),rect)
+    pygame.draw.rect(screen,(0,128,128),rect,1)
+    c = (i, j)
+    if c in game.shots[1] and c in game.ship_at[0]:
+        pygame.draw.rect(screen,(255,0,0),rect)
+    elif c in game.shots[0] and c in game.ship_at[1]:
+        pygame.draw.rect(screen,(0,255,0),rect)
+    elif c in game.shots[0]:
+        pygame.draw.rect(screen,(96,96,96),(i*cell+cell//3, j*cell+cell//3, cell//3, cell//3))
+    return rect
+
+def battleship_mode(pygame, screen, font):
+    # Mode menu drawn in the window, so nothing blocks on the terminal
+    options = ((pygame.K_1, "ai", "1  Play vs AI"), (pygame.K_2, "friend", "2  Play vs Friend"),
+               (pygame.K_3, "online", f"3  Play online ({BATTLESHIP_SERVER})"))
+    screen.fill((0,0,64))
+    for k, (_, _, label) in enumerate(options):
+        screen.blit(TEXT_CACHE.render(font, label, (255,255,255)), (20, 20 + 40*k))
+    pygame.display.flip()
+    while True:
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT:
+            return None
+        if event.type == pygame.KEYDOWN:
+            for key, mode, _ in options:
+                if event.key == key:
+                    return mode
+
+def battleship_game(seed=None, grid_size=10, fleet=BATTLESHIP_FLEET, event_driven=True, profile=None, mode=None):
+    import pygame
     pygame.init()
-    WIDTH, HEIGHT = 500, 500
+    cell = max(8, 500//grid_size)
+    WIDTH = HEIGHT = grid_size*cell
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Battleship")
-    clock = pygame.time.Clock()
     font = pygame.font.SysFont(None, 36)
 
-    grid_size = 10
-    cell = WIDTH//grid_size
-
-    # Mode selection
-    print("Battleship Mode:")
-    print("[1] Play vs AI")
-    print("[2] Play vs Friend")
-    mode = input("Choose mode: ").strip()
-    if mode not in ['1','2']:
-        print("Invalid choice. Returning to panel.")
+    mode = mode or battleship_mode(pygame, screen, font)
+    if mode is None:
+        quit_pygame(pygame)
         return
+    if mode == "online":
+        host, sep, port = BATTLESHIP_SERVER.rpartition(":")
+        if not sep:
+            host, port = port, ""
+        TEXT_CACHE.clear()
+        return battleship_online(host, int(port) if port else BATTLESHIP_PORT, BATTLESHIP_MATCH, event_driven, profile)
 
-    # Random ship for player
-    def place_ship():
-        return [(random.randint(0, grid_size-1), random.randint(0, grid_size-1)) for _ in range(3)]
+    renderer = EventRenderer(pygame, screen, event_driven)
+    prof = make_profiler(pygame, "battleship", profile)
+    rec = Recorder("battleship", seed, grid_size=grid_size, mode=mode, fleet=list(fleet))
+    game = rec.game
+    names = ("You", "AI") if mode == "ai" else ("Player 1", "Player 2")
+    winners = ("You Win!", "AI Wins!") if mode == "ai" else ("Player 1 Wins!", "Player 2 Wins!")
 
-    player_ship = place_ship()
-    if mode=='1':
-        ai_ship = place_ship()
-        player_hits = []
-        ai_hits = []
-        ai_guesses = []
-    else:
-        other_ship = place_ship()
-        player1_hits = []
-        player2_hits = []
-        turn = 1
+    def draw_cell(i, j):
+        renderer.dirty(draw_battleship_cell(pygame, screen, game, cell, i, j))
+
+    def draw_grid():
+        for i in range(grid_size):
+            for j in range(grid_size):
+                draw_cell(i, j)
 
+    draw_grid()
+    renderer.present()
     running = True
     while running:
-        screen.fill((0,0,64))
-        for event in pygame.event.get():
+        events = renderer.events()
+        prof.begin()
+        shots, redraw = [], False
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
-            if event.type == pygame.MOUSEBUTTONDOWN:
+            elif event.type == pygame.VIDEOEXPOSE:
+                redraw = True
+            elif event.type == pygame.MOUSEBUTTONDOWN:
                 x, y = pygame.mouse.get_pos()
-                gx, gy = x//cell, y//cell
-
-                if mode=='1':
-                    # Player guesses AI ship
-                    if (gx,gy) in ai_ship and (gx,gy) not in player_hits:
-                        player_hits.append((gx,gy))
-                    # AI random guess
-                    guess = (random.randint(0, grid_size-1), random.randint(0, grid_size-1))
-                    while guess in ai_guesses: guess = (random.randint(0, grid_size-1), random.randint(0, grid_size-1))
-                    ai_guesses.append(guess)
-                    if guess in player_ship and guess not in ai_hits: ai_hits.append(guess)
-                    # Check win
-                    if len(player_hits)==len(ai_ship):
-                        print("You Win!")
-                        running=False
-                    if len(ai_hits)==len(player_ship):
-                        print("AI Wins!")
-                        running=False
-                else:
-                    if turn==1:
-                        if (gx,gy) in other_ship and (gx,gy) not in player1_hits:
-                            player1_hits.append((gx,gy))
-                        turn=2
-                        if len(player1_hits)==len(other_ship):
-                            print("Player 1 Wins!")
-                            running=False
+                shots.append((x//cell, y//cell))
+        prof.mark("events")
+
+        changed = []
+        for shot in shots:
+            done = rec.step(shot)[1]
+            changed += game.changed
+            if done:
+                print(winners[game.winner])
+                running = False
+                break
+        prof.mark("update")
+
+        if redraw:
+            draw_grid()
+        for player, shot, result in changed:
+            if result == "sunk":
+                print(f"{names[player]} sank a ship!")
+            draw_cell(*shot)
+        prof.hud(screen, renderer)
+        renderer.present()
+        prof.mark("render")
+        prof.end()
+    rec.save()
+    prof.export()
+    quit_pygame(pygame)
+
+# -------------------- Battleship Online --------------------
+# Length-prefixed binary messages: u16 size, u8 kind, payload.
+#   JOIN    grid, ship count, ship lengths..., match name (utf-8, may be empty)
+#   WELCOME player, grid, ship count, ship lengths...
+#   PLACE   (x, y, horizontal, length) per ship
+#   START   player to move first
+#   FIRE    seq u16, x, y
+#   RESULT  seq u16, shooter, x, y, result code, winner (255 = none)
+#   ERROR   message (utf-8)
+NET_JOIN, NET_WELCOME, NET_PLACE, NET_START, NET_FIRE, NET_RESULT, NET_ERROR = range(1, 8)
+NET_RESULTS = ("miss", "hit", "sunk", "repeat", "invalid")
+NET_NOBODY = 255
+BATTLESHIP_PORT = 8765
+BATTLESHIP_SERVER = f"127.0.0.1:{BATTLESHIP_PORT}"  # set by zenpo --connect
+BATTLESHIP_MATCH = ""  # set by zenpo --match
+# Limits on what a JOIN may ask the server for
+BATTLESHIP_MAX_GRID = 26
+BATTLESHIP_MAX_SHIPS = 16
+
+def net_pack(kind, payload=b""):
+    return (len(payload)+1).to_bytes(2, "little") + bytes([kind]) + bytes(payload)
+
+async def net_read(reader):
+    size = int.from_bytes(await reader.readexactly(2), "little")
+    if not size:
+        raise ValueError("Empty message")
+    body = await reader.readexactly(size)
+    return body[0], body[1:]
+
+def pack_fleet(ships):
+    out = bytearray()
+    for ship in ships:
+        (x, y), horizontal = min(ship), len({y for _, y in ship}) == 1
+        out += bytes([x, y, horizontal, len(ship)])
+    return out
+
+def unpack_fleet(payload):
+    return [[(x+k, y) if horizontal else (x, y+k) for k in range(length)]
+            for x, y, horizontal, length in zip(*[iter(payload)]*4)]
+
+class NetMatch:
+    # One game between two connections; the engine runs in "friend" mode so
+    # its turn order is the match's. Both players PLACE their own fleets, so
+    # the server never places one at random
+    def __init__(self, name, grid_size, fleet):
+        self.name = name
+        self.game = BattleshipGame(grid_size, "friend", fleet, placed=False)
+        self.writers = []
+        self.placed = [False, False]
+
+    @property
+    def started(self):
+        return all(self.placed)
+
+    def send_all(self, data):
+        for writer in self.writers:
+            writer.write(data)
+
+class BattleshipServer:
+    # Hosts any number of matches. Players who JOIN with a match name meet in
+    # that match; players without one are paired in arrival order.
+    def __init__(self):
+        self.matches = {}
+        self.waiting = None
+        self.count = 0
+
+    def join(self, name, grid_size, fleet, writer):
+        if not name:
+            if self.waiting is None or self.waiting not in self.matches:
+                self.count += 1
+                self.waiting = f"match-{self.count}"
+            name = self.waiting
+        match = self.matches.get(name)
+        if match is None:
+            match = self.matches[name] = NetMatch(name, grid_size, fleet)
+        elif len(match.writers) == 2:
+            raise ValueError(f"Match {name} is full")
+        match.writers.append(writer)
+        if name == self.waiting and len(match.writers) == 2:
+            self.waiting = None
+        return match, len(match.writers) - 1
+
+    async def handle(self, reader, writer):
+        import asyncio
+        match = None
+        try:
+            kind, payload = await net_read(reader)
+            if kind != NET_JOIN:
+                raise ValueError("Expected JOIN")
+            # Anyone can connect, so every size is checked before it's read
+            if len(payload) < 2 or len(payload) < 2 + payload[1]:
+                raise ValueError("Short JOIN")
+            grid_size, count = payload[0], payload[1]
+            fleet = tuple(payload[2:2+count])
+            if not 1 <= grid_size <= BATTLESHIP_MAX_GRID:
+                raise ValueError(f"Grid must be 1 to {BATTLESHIP_MAX_GRID} cells wide")
+            if not 1 <= count <= BATTLESHIP_MAX_SHIPS:
+                raise ValueError(f"Fleet must have 1 to {BATTLESHIP_MAX_SHIPS} ships")
+            if min(fleet) < 1 or max(fleet) > grid_size or 3*sum(fleet) > grid_size**2:
+                raise ValueError(f"Fleet {fleet} doesn't fit a {grid_size}x{grid_size} grid")
+            match, player = self.join(payload[2+count:].decode(), grid_size, fleet, writer)
+            game = match.game
+            writer.write(net_pack(NET_WELCOME, bytes([player, game.grid_size, len(game.fleet), *game.fleet])))
+            print(f"{match.name}: player {player+1} joined")
+            while True:
+                kind, payload = await net_read(reader)
+                if kind == NET_PLACE and not match.placed[player]:
+                    game.set_fleet(player, unpack_fleet(payload))
+                    match.placed[player] = True
+                    if match.started:
+                        print(f"{match.name}: started")
+                        match.send_all(net_pack(NET_START, bytes([game.turn])))
+                elif kind == NET_FIRE:
+                    if len(payload) != 4:
+                        raise ValueError("Bad FIRE")
+                    seq, x, y = payload[:2], payload[2], payload[3]
+                    if (not match.started or game.turn != player or game.winner is not None
+                            or x >= game.grid_size or y >= game.grid_size):
+                        writer.write(net_pack(NET_RESULT, seq + bytes([player, x, y, NET_RESULTS.index("invalid"), NET_NOBODY])))
+                        continue
+                    game.step((x, y))
+                    winner = NET_NOBODY if game.winner is None else game.winner
+                    result = game.last_result
+                    data = net_pack(NET_RESULT, seq + bytes([player, x, y, NET_RESULTS.index(result), winner]))
+                    if result == "repeat":
+                        writer.write(data)
                     else:
-                        if (gx,gy) in player_ship and (gx,gy) not in player2_hits:
-                            player2_hits.append((gx,gy))
-                        turn=1
-                        if len(player2_hits)==len(player_ship):
-                            print("Player 2 Wins!")
-                            running=False
-
-        # Draw grid
-        for i in range(grid_size):
-            for j in range(grid_size):
-                rect = pygame.Rect(i*cell, j*cell, cell, cell)
-                pygame.draw.rect(screen,(0,128,128),rect,1)
-                if mode=='1':
-                    if (i,j) in player_hits: pygame.draw.rect(screen,(0,255,0),rect)
-                    if (i,j) in ai_hits: pygame.draw.rect(screen,(255,0,0),rect)
-                else:
-                    if (i,j) in player1_hits: pygame.draw.rect(screen,(0,255,0),rect)
-                    if (i,j) in player2_hits: pygame.draw.rect(screen,(255,0,0),rect)
+                        match.send_all(data)
+                    if game.winner is not None:
+                        print(f"{match.name}: player {game.winner+1} won")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ValueError as e:
+            writer.write(net_pack(NET_ERROR, str(e).encode()))
+        finally:
+            if match is not None and self.matches.get(match.name) is match:
+                # Either player leaving ends the match for both
+                del self.matches[match.name]
+                for other in match.writers:
+                    if other is not writer:
+                        other.write(net_pack(NET_ERROR, b"Opponent left"))
+                        other.close()
+                print(f"{match.name}: closed")
+            writer.close()
 
-        pygame.display.flip()
-        clock.tick(30)
-    pygame.quit()
+    async def serve(self, host="127.0.0.1", port=BATTLESHIP_PORT):
+        import asyncio
+        server = await asyncio.start_server(self.handle, host, port)
+        print(Fore.GREEN + f"Battleship server on {host}:{port}" + Style.RESET_ALL)
+        async with server:
+            await server.serve_forever()
+
+def serve_battleship(host="127.0.0.1", port=BATTLESHIP_PORT):
+    import asyncio
+    try:
+        asyncio.run(BattleshipServer().serve(host, port))
+    except KeyboardInterrupt:
+        print("Server stopped.")
+
+class BattleshipClient:
+    # The connection lives on an asyncio loop in a background thread. The game
+    # loop calls fire() (which only schedules a write) and poll() (which
+    # drains a queue), so it never waits on the network. notify() is called
+    # from the network thread after each message, e.g. to wake event.wait().
+    def __init__(self, host, port=BATTLESHIP_PORT, match="", grid_size=10, fleet=BATTLESHIP_FLEET,
+                 seed=None, notify=None):
+        import queue
+        self.host, self.port, self.match = host, port, match
+        self.grid_size, self.fleet = grid_size, tuple(fleet)
+        self.rng = random.Random(seed)
+        self.notify = notify or (lambda: None)
+        self.inbox = queue.Queue()
+        self.loop = self.writer = None
+        self.player = None
+        self.turn = None
+        self.winner = None
+        self.error = None
+        self.ships = []
+        self.ship_cells = set()
+        # My shots at them, their shots at me: cell -> result
+        self.results = [{}, {}]
+        self.seq = 0
+        self.sent = {}
+        self.rtts = []
+
+    def start(self):
+        import asyncio
+        threading.Thread(target=lambda: asyncio.run(self.run()), daemon=True).start()
+        return self
+
+    def send(self, data):
+        if self.loop and self.writer:
+            self.loop.call_soon_threadsafe(self.writer.write, data)
+
+    async def run(self):
+        import asyncio
+        self.loop = asyncio.get_running_loop()
+        try:
+            reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            self.writer.write(net_pack(NET_JOIN, bytes([self.grid_size, len(self.fleet), *self.fleet]) + self.match.encode()))
+            while True:
+                kind, payload = await net_read(reader)
+                if kind == NET_WELCOME:
+                    # Take the match's board and fleet, then place ours
+                    self.grid_size, count = payload[1], payload[2]
+                    self.fleet = tuple(payload[3:3+count])
+                    ships = random_fleet(self.grid_size, self.fleet, self.rng)
+                    self.writer.write(net_pack(NET_PLACE, pack_fleet(ships)))
+                    payload = (payload[0], ships)
+                elif kind == NET_RESULT:
+                    seq = int.from_bytes(payload[:2], "little")
+                    sent = self.sent.pop(seq, None)
+                    payload = (payload[2:], None if sent is None else time.perf_counter() - sent)
+                self.inbox.put((kind, payload))
+                self.notify()
+        except asyncio.IncompleteReadError:
+            self.inbox.put((NET_ERROR, b"Connection closed"))
+            self.notify()
+        except (ConnectionError, OSError, ValueError) as e:
+            self.inbox.put((NET_ERROR, str(e).encode()))
+            self.notify()
+
+    def fire(self, x, y):
+        self.seq = (self.seq + 1) % 65536
+        self.sent[self.seq] = time.perf_counter()
+        self.send(net_pack(NET_FIRE, self.seq.to_bytes(2, "little") + bytes([x, y])))
+
+    def close(self):
+        if self.loop and self.writer and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.writer.close)
+
+    def poll(self):
+        # Apply queued messages; returns (board, cell) pairs that changed
+        # (board 0 is theirs, board 1 is mine)
+        import queue
+        changed = []
+        while True:
+            try:
+                kind, payload = self.inbox.get_nowait()
+            except queue.Empty:
+                return changed
+            if kind == NET_WELCOME:
+                self.player, self.ships = payload
+                self.ship_cells = {c for ship in self.ships for c in ship}
+                changed += [(1, c) for c in self.ship_cells]
+            elif kind == NET_START:
+                self.turn = payload[0]
+            elif kind == NET_RESULT:
+                (shooter, x, y, code, winner), rtt = payload
+                result = NET_RESULTS[code]
+                if rtt is not None and result != "invalid":
+                    self.rtts.append(rtt)
+                if result in ("miss", "hit", "sunk"):
+                    board = 0 if shooter == self.player else 1
+                    self.results[board][(x, y)] = result
+                    changed.append((board, (x, y)))
+                    self.turn = 1 - shooter
+                if winner != NET_NOBODY:
+                    self.winner = winner
+            elif kind == NET_ERROR:
+                self.error = self.error or bytes(payload).decode()
+
+    @property
+    def status(self):
+        if self.winner is not None:
+            return "You win!" if self.winner == self.player else "You lose!"
+        if self.error:
+            return self.error
+        if self.player is None or self.turn is None:
+            return "Waiting for opponent..."
+        rtt = f"  RTT {self.rtts[-1]*1000:.1f} ms" if self.rtts else ""
+        return ("Your turn" if self.turn == self.player else "Their turn") + rtt
+
+def draw_net_cell(pygame, screen, client, cell, board, x, y):
+    # Board 0 (left) is the enemy sea you fire at, board 1 your own fleet
+    rect = pygame.Rect(board*(client.grid_size*cell + cell) + x*cell, y*cell, cell, cell)
+    pygame.draw.rect(screen,(0,0,64),rect)
+    pygame.draw.rect(screen,(0,128,128),rect,1)
+    if board == 1 and (x, y) in client.ship_cells:
+        pygame.draw.rect(screen,(128,128,128),rect.inflate(-2,-2))
+    result = client.results[board].get((x, y))
+    if result in ("hit", "sunk"):
+        pygame.draw.rect(screen,(0,255,0) if board == 0 else (255,0,0),rect.inflate(-2,-2))
+    elif result == "miss":
+        pygame.draw.rect(screen,(96,96,96),(rect.x+cell//3, rect.y+cell//3, cell//3, cell//3))
+    return rect
+
+def battleship_online(host, port=BATTLESHIP_PORT, match="", event_driven=True, profile=None):
+    import pygame
+    pygame.init()
+    NET_EVENT = pygame.USEREVENT + 1
+    client = BattleshipClient(host, port, match, notify=lambda: pygame.event.post(pygame.event.Event(NET_EVENT))).start()
+    renderer = cell = None
+    prof = make_profiler(pygame, "battleship-online", profile)
+    caption = None
+    running = True
+    while running:
+        events = renderer.events() if renderer else [pygame.event.wait(100)] + pygame.event.get()
+        prof.begin()
+        shots = []
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN and renderer:
+                x, y = pygame.mouse.get_pos()
+                if x < client.grid_size*cell:
+                    shots.append((x//cell, y//cell))
+        prof.mark("events")
+
+        changed = client.poll()
+        for x, y in shots:
+            if client.turn == client.player and client.winner is None and (x, y) not in client.results[0]:
+                client.fire(x, y)
+        prof.mark("update")
+
+        if renderer is None and client.player is not None:
+            # The board size comes from the server, so the window opens on WELCOME
+            n = client.grid_size
+            cell = max(8, 400//n)
+            screen = pygame.display.set_mode((2*n*cell + cell, n*cell))
+            renderer = EventRenderer(pygame, screen, event_driven)
+            changed = [(board, (x, y)) for board in (0, 1) for x in range(n) for y in range(n)]
+        if renderer:
+            for board, (x, y) in changed:
+                renderer.dirty(draw_net_cell(pygame, screen, client, cell, board, x, y))
+            prof.hud(screen, renderer)
+            renderer.present()
+        if client.status != caption:
+            caption = client.status
+            pygame.display.set_caption(f"Battleship online: {caption}")
+            if client.turn is None or client.winner is not None or client.error:
+                print(caption)
+        prof.mark("render")
+        prof.end()
+        if client.error and renderer is None:
+            running = False
+    client.close()
+    if client.rtts:
+        rtts = sorted(client.rtts)
+        print(f"RTT over {len(rtts)} shots: mean {sum(rtts)/len(rtts)*1000:.1f} ms, "
+              f"p50 {rtts[len(rtts)//2]*1000:.1f} ms, max {rtts[-1]*1000:.1f} ms")
+    prof.export()
+    quit_pygame(pygame)
 
 # -------------------- Tetris (Basic playable) --------------------
-def tetris_game():
+TETRIS_GRAVITY_HZ = 3
+TETRIS_PIECES = [
+    [[1,1,1,1]],
+    [[1,1],[1,1]],
+    [[0,1,0],[1,1,1]],
+    [[1,0,0],[1,1,1]],
+    [[0,0,1],[1,1,1]],
+    [[1,1,0],[0,1,1]],
+    [[0,1,1],[1,1,0]]
+]
+
+# Aggregate height, lines, holes, bumpiness weights for the placement search
+TETRIS_AI_WEIGHTS = (-0.510066, 0.760666, -0.35663, -0.184483)
+
+class TetrisRotation:
+    __slots__ = ("shape", "cells", "width", "height", "masks")
+
+    def __init__(self, shape, board_width):
+        self.shape = shape
+        self.cells = [(x, y) for y,row in enumerate(shape) for x,v in enumerate(row) if v]
+        self.width, self.height = len(shape[0]), len(shape)
+        mask = 0
+        for x, y in self.cells:
+            mask |= 1 << (y*board_width + x)
+        # One pre-shifted mask per legal column
+        self.masks = [mask << x for x in range(board_width - self.width + 1)]
+
+def tetris_rotations(board_width):
+    rotations = []
+    for shape in TETRIS_PIECES:
+        shapes = []
+        while shape not in shapes:
+            shapes.append(shape)
+            shape = [list(row) for row in zip(*shape[::-1])]
+        rotations.append([TetrisRotation(sh, board_width) for sh in shapes])
+    return rotations
+
+class TetrisGame:
+    # The board is one int: row y occupies bits y*width .. y*width+width-1 and
+    # an extra full row below the bottom acts as the floor. Collision, locking
+    # and line clears are shifts and ands on that int.
+    # Actions: "left", "right", "down" (soft drop), "rotate", "drop" (hard
+    # drop), ("place", rotation, x) and None, which is one gravity tick.
+    def __init__(self, width=10, height=20, seed=None):
+        self.width, self.height = width, height
+        self.full_row = (1 << width) - 1
+        self.rotations = tetris_rotations(width)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.board = self.full_row << (self.height*self.width)
+        self.lines = 0
+        self.pieces_placed = 0
+        self.done = False
+        self.spawn()
+        return self.observe()
+
+    def spawn(self):
+        self.kind = self.rng.randrange(len(TETRIS_PIECES))
+        self.rotation = 0
+        self.x, self.y = self.width//2-1, 0
+        if self.collides(self.board, self.kind, 0, self.x, 0):
+            self.done = True
+
+    def collides(self, board, kind, rotation, x, y):
+        masks = self.rotations[kind][rotation].masks
+        if x < 0 or x >= len(masks):
+            return True
+        return board & (masks[x] << (y*self.width)) != 0
+
+    def drop_y(self, board, kind, rotation, x, y):
+        while not self.collides(board, kind, rotation, x, y+1):
+            y += 1
+        return y
+
+    def lock_board(self, board, kind, rotation, x, y):
+        # Returns (board, lines cleared) after locking the piece at (x, y)
+        rot = self.rotations[kind][rotation]
+        w = self.width
+        board |= rot.masks[x] << (y*w)
+        cleared = 0
+        for row in range(y, y+rot.height):
+            if (board >> (row*w)) & self.full_row == self.full_row:
+                below = (board >> ((row+1)*w)) << ((row+1)*w)
+                above = board & ((1 << (row*w)) - 1)
+                board = below | (above << w)
+                cleared += 1
+        return board, cleared
+
+    def lock(self):
+        self.board, cleared = self.lock_board(self.board, self.kind, self.rotation, self.x, self.y)
+        self.lines += cleared
+        self.pieces_placed += 1
+        self.spawn()
+        return cleared
+
+    def step(self, action=None):
+        if self.done:
+            return 0, True
+        k, r, x, y = self.kind, self.rotation, self.x, self.y
+        if action == "left" and not self.collides(self.board, k, r, x-1, y): self.x -= 1
+        elif action == "right" and not self.collides(self.board, k, r, x+1, y): self.x += 1
+        elif action == "down" and not self.collides(self.board, k, r, x, y+1): self.y += 1
+        elif action == "rotate":
+            r = (r+1) % len(self.rotations[k])
+            if not self.collides(self.board, k, r, x, y): self.rotation = r
+        elif action == "drop":
+            self.y = self.drop_y(self.board, k, r, x, y)
+            return self.lock(), self.done
+        elif action is None:
+            if not self.collides(self.board, k, r, x, y+1):
+                self.y += 1
+            else:
+                return self.lock(), self.done
+        elif action[0] == "place":
+            _, r, x = action
+            if self.collides(self.board, k, r, x, y):
+                return 0, self.done
+            self.rotation, self.x = r, x
+            self.y = self.drop_y(self.board, k, r, x, y)
+            return self.lock(), self.done
+        return 0, self.done
+
+    # -- placement search --
+    def evaluate(self, board, cleared):
+        w, full = self.width, self.full_row
+        seen = holes = 0
+        heights = [0]*w
+        for row in range(self.height):
+            bits = (board >> (row*w)) & full
+            holes += bin(~bits & seen & full).count("1")
+            new = bits & ~seen
+            while new:
+                low = new & -new
+                heights[low.bit_length()-1] = self.height - row
+                new ^= low
+            seen |= bits
+        bumpiness = sum(abs(heights[i]-heights[i+1]) for i in range(w-1))
+        wh, wl, wo, wb = TETRIS_AI_WEIGHTS
+        return wh*sum(heights) + wl*cleared + wo*holes + wb*bumpiness
+
+    def placements(self):
+        # Every (rotation, x) the current piece can be dropped from
+        k, y = self.kind, self.y
+        for r, rot in enumerate(self.rotations[k]):
+            for x in range(len(rot.masks)):
+                if not self.collides(self.board, k, r, x, y):
+                    yield r, x
+
+    def best_placement(self):
+        best, best_score = None, None
+        k, y = self.kind, self.y
+        for r, x in self.placements():
+            board, cleared = self.lock_board(self.board, k, r, x, self.drop_y(self.board, k, r, x, y))
+            score = self.evaluate(board, cleared)
+            if best_score is None or score > best_score:
+                best, best_score = (r, x), score
+        return best
+
+    def autoplay(self):
+        move = self.best_placement()
+        if move is None:
+            self.done = True
+            return 0, True
+        return self.step(("place", *move))
+
+    @property
+    def piece(self):
+        return self.rotations[self.kind][self.rotation].shape
+
+    @property
+    def grid(self):
+        w = self.width
+        return [[(self.board >> (y*w + x)) & 1 for x in range(w)] for y in range(self.height)]
+
+    def observe(self):
+        return {"grid": self.grid, "piece": [row[:] for row in self.piece],
+                "x": self.x, "y": self.y, "lines": self.lines, "done": self.done}
+
+def draw_tetris(pygame, screen, game, block_size):
+    screen.fill((0,0,0))
+    w, board = game.width, game.board
+    for y in range(game.height):
+        row = (board >> (y*w)) & game.full_row
+        for x in range(w):
+            if row >> x & 1: pygame.draw.rect(screen,(0,255,255),(x*block_size,y*block_size,block_size,block_size))
+    for x,y in game.rotations[game.kind][game.rotation].cells:
+        pygame.draw.rect(screen,(255,0,255),((game.x+x)*block_size,(game.y+y)*block_size,block_size,block_size))
+
+def tetris_game(seed=None, autoplay=False, profile=None):
+    import pygame
     pygame.init()
     WIDTH, HEIGHT = 200, 400
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Tetris")
-    clock = pygame.time.Clock()
+    # Moves apply on the frame they're read; gravity runs on the fixed step
+    loop = FixedStepLoop(pygame, TETRIS_GRAVITY_HZ, buffer=16)
+    prof = make_profiler(pygame, "tetris", profile)
     font = pygame.font.SysFont(None, 24)
 
-    # Simple falling blocks
     block_size = 20
-    grid_w = WIDTH//block_size
-    grid_h = HEIGHT//block_size
-    grid = [[0]*grid_w for _ in range(grid_h)]
-
-    # Pieces
-    pieces = [
-        [[1,1,1,1]],
-        [[1,1],[1,1]],
-        [[0,1,0],[1,1,1]],
-        [[1,0,0],[1,1,1]],
-        [[0,0,1],[1,1,1]],
-        [[1,1,0],[0,1,1]],
-        [[0,1,1],[1,1,0]]
-    ]
-
-    current_piece = random.choice(pieces)
-    piece_x, piece_y = grid_w//2-1,0
-
-    def can_move(px,py,shape):
-        for y,row in enumerate(shape):
-            for x,v in enumerate(row):
-                if v:
-                    gx,gy = px+x, py+y
-                    if gx<0 or gx>=grid_w or gy>=grid_h or grid[gy][gx]:
-                        return False
-        return True
-
-    def place_piece(px,py,shape):
-        for y,row in enumerate(shape):
-            for x,v in enumerate(row):
-                if v:
-                    grid[py+y][px+x]=1
+    rec = Recorder("tetris", seed, width=WIDTH//block_size, height=HEIGHT//block_size)
+    game = rec.game
+    keys = {pygame.K_LEFT: "left", pygame.K_RIGHT: "right", pygame.K_DOWN: "down", pygame.K_UP: "rotate"}
 
     running = True
-    drop_counter = 0
-    drop_speed = 10
+    draw_tetris(pygame, screen, game, block_size)
+    pygame.display.flip()
     while running:
-        clock.tick(30)
-        drop_counter +=1
-        for event in pygame.event.get():
+        events = loop.events()
+        prof.begin()
+        for event in events:
             if event.type == pygame.QUIT: running=False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_LEFT and can_move(piece_x-1,piece_y,current_piece): piece_x-=1
-                if event.key == pygame.K_RIGHT and can_move(piece_x+1,piece_y,current_piece): piece_x+=1
-                if event.key == pygame.K_DOWN and can_move(piece_x,piece_y+1,current_piece): piece_y+=1
-                if event.key == pygame.K_UP:
-                    rotated = [list(row) for row in zip(*current_piece[::-1])]
-                    if can_move(piece_x,piece_y,rotated): current_piece=rotated
-
-        if drop_counter>=drop_speed:
-            if can_move(piece_x,piece_y+1,current_piece):
-                piece_y+=1
+            elif event.type == pygame.KEYDOWN and event.key in keys and not autoplay:
+                loop.push(keys[event.key])
+        prof.mark("events")
+
+        actions = loop.drain()
+        for action in actions:
+            rec.step(action)
+        steps = loop.steps()
+        for _ in range(steps):
+            if autoplay:
+                rec.autoplay()
             else:
-                place_piece(piece_x,piece_y,current_piece)
-                current_piece = random.choice(pieces)
-                piece_x,piece_y = grid_w//2-1,0
-                # Clear lines
-                grid=[row for row in grid if any(v==0 for v in row)]
-                while len(grid)<grid_h:
-                    grid.insert(0,[0]*grid_w)
-            drop_counter=0
-
-        screen.fill((0,0,0))
-        for y,row in enumerate(grid):
-            for x,v in enumerate(row):
-                if v: pygame.draw.rect(screen,(0,255,255),(x*block_size,y*block_size,block_size,block_size))
-        for y,row in enumerate(current_piece):
-            for x,v in enumerate(row):
-                if v: pygame.draw.rect(screen,(255,0,255),((piece_x+x)*block_size,(piece_y+y)*block_size,block_size,block_size))
-        pygame.display.flip()
-    pygame.quit()
+                rec.step(None)
+            if game.done:
+                break
+        prof.mark("update")
+        if game.done:
+            print(f"Game Over! Lines: {game.lines}")
+            break
+
+        if actions or steps:
+            draw_tetris(pygame, screen, game, block_size)
+            prof.hud(screen)
+            pygame.display.flip()
+        prof.mark("render")
+        prof.end()
+    rec.save()
+    prof.export()
+    quit_pygame(pygame)
+
+# -------------------- Minesweeper --------------------
+# bytes.translate tables between cell values (0-9) and hex digits
+_CELL_TO_HEX = bytes(b"0123456789abcdef"[i] if i < 16 else 0 for i in range(256))
+_HEX_TO_CELL = bytes(int(chr(i), 16) if chr(i) in "0123456789abcdef" else 0 for i in range(256))
+
+def neighbour_counts(mines, n):
+    # Pack every row into an int with one hex digit per cell. The 3x3 sums are
+    # then a few bigint shifts/adds per row (max 9, so digits never carry),
+    # which keeps 1000x1000 boards well under a second.
+    mask = (1 << (4*n)) - 1
+    sums = []
+    for y in range(n):
+        row = int(mines[y*n:(y+1)*n].translate(_CELL_TO_HEX)[::-1], 16)
+        sums.append(row + ((row << 4) & mask) + (row >> 4))
+    counts = bytearray(n*n)
+    for y in range(n):
+        total = sums[y]
+        if y > 0: total += sums[y-1]
+        if y < n-1: total += sums[y+1]
+        counts[y*n:(y+1)*n] = format(total, f"0{n}x")[::-1].encode().translate(_HEX_TO_CELL)
+    return counts
+
+class MinesweeperGame:
+    # Cells are flat indices (y*grid_size + x) into bytearrays. Mines are
+    # sampled without replacement, neighbour counts are computed once, and
+    # revealing a zero flood-fills its region iteratively.
+    # Actions: ("reveal", x, y) or ("flag", x, y)
+    def __init__(self, grid_size=8, mine_count=None, seed=None):
+        self.grid_size = grid_size
+        if mine_count is None:
+            mine_count = round(grid_size*grid_size * 10/64)
+        self.mine_count = min(mine_count, grid_size*grid_size - 1)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        n = self.grid_size
+        self.mines = bytearray(n*n)
+        for i in self.rng.sample(range(n*n), self.mine_count):
+            self.mines[i] = 1
+        self.counts = neighbour_counts(self.mines, n)
+        self.revealed = bytearray(n*n)
+        self.flags = bytearray(n*n)
+        self.revealed_count = 0
+        self.lost = False
+        self.changed = []
+        return self.observe()
+
+    def count_adjacent(self, x, y):
+        return self.counts[y*self.grid_size + x]
+
+    @property
+    def won(self):
+        return self.revealed_count == self.grid_size**2 - self.mine_count
 
-# -------------------- Minesweeper (Basic playable) --------------------
-def minesweeper_game():
+    def reveal(self, i):
+        n, counts, revealed, flags = self.grid_size, self.counts, self.revealed, self.flags
+        changed = self.changed
+        revealed[i] = 1
+        changed.append(i)
+        stack = [i] if counts[i] == 0 else []
+        while stack:
+            y, x = divmod(stack.pop(), n)
+            for ny in range(max(0, y-1), min(n, y+2)):
+                for j in range(ny*n + max(0, x-1), ny*n + min(n, x+2)):
+                    if not revealed[j] and not flags[j]:
+                        revealed[j] = 1
+                        changed.append(j)
+                        if counts[j] == 0:
+                            stack.append(j)
+        self.revealed_count += len(changed)
+        return len(changed)
+
+    def step(self, action):
+        if self.lost or self.won:
+            return 0, True
+        kind, x, y = action
+        n = self.grid_size
+        # Cells whose state changed this step, for redraws
+        self.changed = []
+        if not (0 <= x < n and 0 <= y < n):
+            return 0, False
+        i = y*n + x
+        if kind == "reveal" and not self.revealed[i] and not self.flags[i]:
+            if self.mines[i]:
+                self.lost = True
+                return -1, True
+            return self.reveal(i), self.won
+        elif kind == "flag" and not self.revealed[i]:
+            self.flags[i] ^= 1
+            self.changed.append(i)
+        return 0, False
+
+    def observe(self):
+        n = self.grid_size
+        return {"revealed": {(i % n, i // n): self.counts[i] for i in range(n*n) if self.revealed[i]},
+                "flags": [(i % n, i // n) for i in range(n*n) if self.flags[i]],
+                "lost": self.lost, "won": self.won, "done": self.lost or self.won}
+
+# Components with more cells than this, or needing more search nodes, get a
+# per-constraint estimate instead of exact enumeration
+MINESWEEPER_ENUM_CELLS = 32
+MINESWEEPER_ENUM_NODES = 200000
+# Up to this many frontier cells in total, components are coupled exactly
+# through the global mine count; beyond it each is weighted by mine density
+MINESWEEPER_EXACT_FRONTIER = 200
+
+class MinesweeperSolver:
+    # Keeps a constraint per revealed number: (unknown neighbours, mines left
+    # among them), and `watch` maps each frontier cell to the constraints it
+    # is in. update() only touches cells the last move revealed, and
+    # propagate() only re-checks constraints those changed, so the work per
+    # move follows the frontier, not the board size. Rules: a constraint with
+    # 0 mines left is all safe, one with as many mines as cells is all mines,
+    # and when A's cells are inside B's, the rest of B holds B's mines minus
+    # A's, which the first two rules can settle. When that runs dry,
+    # probabilities() enumerates each connected frontier component exactly.
+    def __init__(self, game):
+        self.game = game
+        n = game.grid_size
+        self.mine = bytearray(n*n)      # deduced mines
+        self.cleared = bytearray(n*n)   # deduced safe (may not be revealed yet)
+        self.seen = bytearray(n*n)      # revealed cells already processed
+        self.safe = []                  # stack of deduced safe cells to reveal
+        self.pending = 0                # deduced safe cells not yet revealed
+        self.mines_found = 0
+        self.constraints = {}
+        self.watch = {}
+        self.dirty = set()
+        self.seconds = 0.0
+        self.guesses = 0
+        self.rng = random.Random(f"solver{game.seed}")
+        self.probe = None
+        self.scan = 0
+        self.enumerated = {}
+        self.update(i for i in range(n*n) if game.revealed[i])
+        # Time spent on moves only; the full-board scan above is setup
+        self.seconds = 0.0
+
+    def neighbours(self, i):
+        n = self.game.grid_size
+        y, x = divmod(i, n)
+        return [j for ny in range(max(0, y-1), min(n, y+2))
+                for j in range(ny*n + max(0, x-1), ny*n + min(n, x+2)) if j != i]
+
+    def update(self, cells):
+        # Feed cells revealed since the last call (game.changed)
+        start = time.perf_counter()
+        game, mine, cleared = self.game, self.mine, self.cleared
+        for i in cells:
+            if not game.revealed[i] or self.seen[i]:
+                continue
+            self.seen[i] = 1
+            if cleared[i]:
+                self.pending -= 1
+            for k in self.watch.pop(i, ()):
+                self.constraints[k][0].discard(i)
+                self.dirty.add(k)
+            if game.counts[i]:
+                around = self.neighbours(i)
+                cells = {j for j in around if not game.revealed[j] and not mine[j] and not cleared[j]}
+                if cells:
+                    self.constraints[i] = [cells, game.counts[i] - sum(mine[j] for j in around)]
+                    for j in cells:
+                        self.watch.setdefault(j, set()).add(i)
+                    self.dirty.add(i)
+        self.propagate()
+        self.seconds += time.perf_counter() - start
+
+    def set_mine(self, j):
+        if self.mine[j]:
+            return
+        self.mine[j] = 1
+        self.mines_found += 1
+        for k in self.watch.pop(j, ()):
+            c = self.constraints[k]
+            c[0].discard(j)
+            c[1] -= 1
+            self.dirty.add(k)
+
+    def set_safe(self, j):
+        if self.cleared[j] or self.game.revealed[j]:
+            return
+        self.cleared[j] = 1
+        self.pending += 1
+        self.safe.append(j)
+        for k in self.watch.pop(j, ()):
+            self.constraints[k][0].discard(j)
+            self.dirty.add(k)
+
+    def settle(self, cells, mines):
+        # All of `cells` are mines if mines == len(cells), all safe if 0
+        if mines == 0:
+            for j in list(cells):
+                self.set_safe(j)
+        elif mines == len(cells):
+            for j in list(cells):
+                self.set_mine(j)
+        else:
+            return False
+        return True
+
+    def propagate(self):
+        constraints = self.constraints
+        while self.dirty:
+            k = self.dirty.pop()
+            c = constraints.get(k)
+            if c is None:
+                continue
+            cells, left = c
+            if not cells:
+                del constraints[k]
+                continue
+            if self.settle(cells, left):
+                continue
+            for o in set().union(*(self.watch[j] for j in cells)) - {k}:
+                oc = constraints.get(o)
+                if oc is None:
+                    continue
+                ocells, oleft = oc
+                if cells <= ocells and self.settle(ocells - cells, oleft - left):
+                    break
+                if ocells <= cells and self.settle(cells - ocells, left - oleft):
+                    break
+
+    def components(self):
+        # Frontier cells grouped by shared constraints
+        seen, groups = set(), []
+        for start in self.watch:
+            if start in seen:
+                continue
+            seen.add(start)
+            cells, keys, stack = [], set(), [start]
+            while stack:
+                j = stack.pop()
+                cells.append(j)
+                for k in self.watch[j]:
+                    if k in keys:
+                        continue
+                    keys.add(k)
+                    for other in self.constraints[k][0]:
+                        if other not in seen:
+                            seen.add(other)
+                            stack.append(other)
+            groups.append((cells, [self.constraints[k] for k in keys]))
+        return groups
+
+    def enumerate(self, cells, constraints):
+        # {mines: [solutions, per-cell mine tallies]} or None if too big
+        if len(cells) > MINESWEEPER_ENUM_CELLS:
+            return None
+        index = {j: p for p, j in enumerate(cells)}
+        left = [c[1] for c in constraints]
+        free = [len(c[0]) for c in constraints]
+        placed = [0]*len(constraints)
+        of_cell = [[] for _ in cells]
+        for ci, (cset, _) in enumerate(constraints):
+            for j in cset:
+                of_cell[index[j]].append(ci)
+        results, value, nodes = {}, [0]*len(cells), [0]
+
+        def go(p, k):
+            nodes[0] += 1
+            if nodes[0] > MINESWEEPER_ENUM_NODES:
+                raise OverflowError
+            if p == len(cells):
+                entry = results.setdefault(k, [0, [0]*len(cells)])
+                entry[0] += 1
+                tally = entry[1]
+                for q in range(len(cells)):
+                    tally[q] += value[q]
+                return
+            cs = of_cell[p]
+            for v in (0, 1):
+                for ci in cs:
+                    m = placed[ci] + v
+                    if m > left[ci] or m + free[ci] - 1 < left[ci]:
+                        break
+                else:
+                    for ci in cs:
+                        placed[ci] += v
+                        free[ci] -= 1
+                    value[p] = v
+                    go(p+1, k+v)
+                    for ci in cs:
+                        placed[ci] -= v
+                        free[ci] += 1
+            value[p] = 0
+
+        try:
+            go(0, 0)
+        except OverflowError:
+            return None
+        return results
+
+    def probabilities(self):
+        # Mine probability of each frontier cell, and of any other unknown cell
+        game = self.game
+        mines_left = game.mine_count - self.mines_found
+        unknown = game.grid_size**2 - game.revealed_count - self.mines_found - self.pending
+        interior = unknown - len(self.watch)
+        # Components the last move didn't touch reuse their enumeration
+        cache, self.enumerated = self.enumerated, {}
+        groups = []
+        for cells, cons in self.components():
+            key = frozenset((frozenset(c[0]), c[1]) for c in cons)
+            cells, r = cache[key] if key in cache else (cells, self.enumerate(cells, cons))
+            self.enumerated[key] = cells, r
+            groups.append((cells, r))
+        probs, expected = {}, 0.0
+        exact = len(self.watch) <= MINESWEEPER_EXACT_FRONTIER and all(r for _, r in groups)
+        if exact and groups:
+            # Weight each combination of component mine counts by the ways to
+            # put the remaining mines in the interior
+            def log_ways(m):
+                if m < 0 or m > interior:
+                    return None
+                return math.lgamma(interior+1) - math.lgamma(m+1) - math.lgamma(interior-m+1)
+            total = {0: 1}
+            for _, r in groups:
+                nxt = {}
+                for a, wa in total.items():
+                    for k, (ways, _) in r.items():
+                        nxt[a+k] = nxt.get(a+k, 0) + wa*ways
+                total = nxt
+            logs = {t: log_ways(mines_left - t) for t in total}
+            top = max((v for v in logs.values() if v is not None), default=0.0)
+            weight = {t: total[t]*math.exp(logs[t] - top) for t in total if logs[t] is not None}
+            z = sum(weight.values()) or 1.0
+            for g, (cells, r) in enumerate(groups):
+                # Mine-count distribution of every other component together
+                rest = {0: 1}
+                for h, (_, r2) in enumerate(groups):
+                    if h == g:
+                        continue
+                    nxt = {}
+                    for a, wa in rest.items():
+                        for k, (ways, _) in r2.items():
+                            nxt[a+k] = nxt.get(a+k, 0) + wa*ways
+                    rest = nxt
+                acc = [0.0]*len(cells)
+                for k, (_, tally) in r.items():
+                    w = sum(wr*math.exp(logs[k+j] - top) for j, wr in rest.items() if logs.get(k+j) is not None)
+                    for q in range(len(cells)):
+                        acc[q] += tally[q]*w
+                for q, j in enumerate(cells):
+                    probs[j] = acc[q] / z
+            expected = sum(mines*weight.get(mines, 0.0) for mines in total) / z
+        else:
+            # Big frontier: components are nearly independent, so weight each
+            # one's solutions by density**mines
+            density = min(max(mines_left / max(unknown, 1), 1e-9), 1 - 1e-9)
+            odds = density / (1 - density)
+            for cells, r in groups:
+                if r is None:
+                    for j in cells:
+                        probs[j] = max(self.constraints[k][1] / len(self.constraints[k][0]) for k in self.watch[j])
+                    continue
+                z = sum(ways * odds**k for k, (ways, _) in r.items()) or 1.0
+                for q, j in enumerate(cells):
+                    probs[j] = sum(tally[q] * odds**k for k, (_, tally) in r.items()) / z
+            expected = sum(probs.values())
+        return probs, min(max((mines_left - expected) / interior, 0.0), 1.0) if interior > 0 else 1.0
+
+    def interior_cell(self):
+        # An unknown cell off the frontier, or None; the same one until it
+        # stops qualifying, so repeated hints agree. Random probes find one
+        # fast while there are many; once they're rare (a few pockets on a big
+        # board) a scan picks up where it left off. A cell it passes never
+        # qualifies again, so the scan costs one pass over the board in total.
+        game, n = self.game, self.game.grid_size
+
+        def unknown(i):
+            return not (game.revealed[i] or self.mine[i] or self.cleared[i] or i in self.watch)
+
+        for _ in range(1000):
+            if self.probe is not None and unknown(self.probe):
+                return self.probe
+            self.probe = self.rng.randrange(n*n)
+        while self.scan < n*n:
+            if unknown(self.scan):
+                self.probe = self.scan
+                return self.probe
+            self.scan += 1
+        return None
+
+    def safe_cell(self):
+        # Revealed cells are dropped from the stack lazily
+        while self.safe:
+            j = self.safe[-1]
+            if not self.game.revealed[j]:
+                return j
+            self.safe.pop()
+        return None
+
+    def hint(self):
+        # ("safe", cell, 0.0) when a safe cell is known, else ("guess", cell,
+        # mine probability); certainties found by enumeration are kept
+        start = time.perf_counter()
+        try:
+            j = self.safe_cell()
+            if j is not None:
+                return "safe", j, 0.0
+            probs, p_interior = self.probabilities()
+            for j, p in probs.items():
+                if p <= 1e-12:
+                    self.set_safe(j)
+                elif p >= 1 - 1e-12:
+                    self.set_mine(j)
+            self.propagate()
+            j = self.safe_cell()
+            if j is not None:
+                return "safe", j, 0.0
+            # Cells just settled above are no longer on the frontier
+            probs = {j: p for j, p in probs.items() if j in self.watch}
+            best = min(probs, key=probs.get, default=None)
+            inner = self.interior_cell() if best is None or p_interior < probs[best] else None
+            if inner is not None:
+                return "guess", inner, p_interior
+            if best is None:
+                raise ValueError("No unknown cells left")
+            return "guess", best, probs[best]
+        finally:
+            self.seconds += time.perf_counter() - start
+
+    def next_action(self):
+        kind, j, _ = self.hint()
+        if kind == "guess":
+            self.guesses += 1
+        y, x = divmod(j, self.game.grid_size)
+        # A wrong flag on a safe cell has to come off before it can be revealed
+        return ("flag" if self.game.flags[j] else "reveal", x, y)
+
+    def solve(self, step=None):
+        # Play until the game ends; step defaults to game.step (pass
+        # Recorder.step to record). Returns (moves, guesses, seconds)
+        step = step or self.game.step
+        game, moves, guesses = self.game, 0, self.guesses
+        start = time.perf_counter()
+        while not (game.won or game.lost):
+            step(self.next_action())
+            self.update(game.changed)
+            moves += 1
+        return moves, self.guesses - guesses, time.perf_counter() - start
+
+def solve_minesweeper(grid_size=8, mine_count=None, seed=None):
+    # zenpo minesweeper --solve: let the solver play one game headlessly
+    rec = Recorder("minesweeper", seed, grid_size=grid_size, mine_count=mine_count)
+    game = rec.game
+    print(f"Solving {grid_size}x{grid_size} with {game.mine_count} mines (seed {seed})")
+    start = time.perf_counter()
+    solver = MinesweeperSolver(game)
+    setup = time.perf_counter() - start
+    moves, guesses, seconds = solver.solve(rec.step)
+    cells = grid_size**2 - game.mine_count
+    colour = Fore.GREEN if game.won else Fore.RED
+    print(colour + ("Solved" if game.won else "Hit a mine") + Style.RESET_ALL +
+          f" after {moves:,} move{'' if moves == 1 else 's'}, {guesses} guess{'' if guesses == 1 else 'es'}, "
+          f"{game.revealed_count:,}/{cells:,} cells revealed")
+    print(f"{setup*1000:.1f} ms setup, {seconds*1000:.1f} ms playing, of which {solver.seconds*1000:.1f} ms "
+          f"in the solver ({solver.seconds*1e6/max(moves, 1):.1f} us/move)")
+    rec.save()
+    return game.won
+
+def draw_minesweeper_cell(pygame, screen, font, game, c, rect):
+    colour = (200,200,200) if game.revealed[c] else (255,0,0) if game.flags[c] else (192,192,192)
+    pygame.draw.rect(screen,colour,rect)
+    pygame.draw.rect(screen,(0,0,0),rect,1)
+    if game.revealed[c]:
+        text = TEXT_CACHE.render(font, str(game.counts[c]), (0,0,0))
+        screen.blit(text,(rect[0]+5,rect[1]+5))
+    return rect
+
+def minesweeper_game(seed=None, grid_size=8, mine_count=None, event_driven=True, profile=None):
+    import pygame
     pygame.init()
-    WIDTH, HEIGHT = 400, 400
+    # Big boards get a scrolling view (arrow keys) instead of tiny cells
+    cell = max(16, 400//grid_size)
+    view = min(grid_size, 800//cell)
+    WIDTH = HEIGHT = view*cell
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Minesweeper")
-    clock = pygame.time.Clock()
+    renderer = EventRenderer(pygame, screen, event_driven)
+    prof = make_profiler(pygame, "minesweeper", profile)
     font = pygame.font.SysFont(None, 24)
 
-    grid_size = 8
-    cell = WIDTH//grid_size
-    mines = [(random.randint(0,grid_size-1), random.randint(0,grid_size-1)) for _ in range(10)]
-    revealed = []
-    flags = []
+    rec = Recorder("minesweeper", seed, grid_size=grid_size, mine_count=mine_count)
+    game = rec.game
+    # h shows the solver's next move, a lets it play the rest of the game
+    solver = MinesweeperSolver(game)
+    ox = oy = 0
+    scroll = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0), pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}
+
+    def draw_cell(i, j):
+        c = (oy+j)*grid_size + ox+i
+        renderer.dirty(draw_minesweeper_cell(pygame, screen, font, game, c, pygame.Rect(i*cell,j*cell,cell,cell)))
 
-    def count_adjacent(x,y):
-        return sum((nx,ny) in mines for nx in range(x-1,x+2) for ny in range(y-1,y+2))
+    def draw_view():
+        for i in range(view):
+            for j in range(view):
+                draw_cell(i, j)
 
+    draw_view()
+    renderer.present()
     running = True
     while running:
-        screen.fill((192,192,192))
-        for event in pygame.event.get():
+        events = renderer.events()
+        prof.begin()
+        actions, redraw = [], False
+        for event in events:
             if event.type == pygame.QUIT: running=False
-            if event.type == pygame.MOUSEBUTTONDOWN:
+            elif event.type == pygame.VIDEOEXPOSE: redraw = True
+            elif event.type == pygame.KEYDOWN and event.key in scroll:
+                dx, dy = scroll[event.key]
+                ox = min(max(0, ox + dx*(view//2)), grid_size - view)
+                oy = min(max(0, oy + dy*(view//2)), grid_size - view)
+                redraw = True
+            elif event.type == pygame.KEYDOWN and event.key in (pygame.K_h, pygame.K_a):
+                actions.append(event.key)
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 3):
                 mx,my = pygame.mouse.get_pos()
-                gx,gy = mx//cell,my//cell
-                if event.button==1:
-                    if (gx,gy) in mines:
-                        print("Game Over!")
-                        running=False
-                    else:
-                        revealed.append((gx,gy))
-                elif event.button==3:
-                    if (gx,gy) not in flags: flags.append((gx,gy))
-                    else: flags.remove((gx,gy))
+                actions.append(("reveal" if event.button==1 else "flag", ox + mx//cell, oy + my//cell))
+        prof.mark("events")
 
-        for i in range(grid_size):
-            for j in range(grid_size):
-                rect = pygame.Rect(i*cell,j*cell,cell,cell)
-                pygame.draw.rect(screen,(0,0,0),rect,1)
-                if (i,j) in revealed:
-                    adj = count_adjacent(i,j)
-                    pygame.draw.rect(screen,(200,200,200),rect)
-                    text = font.render(str(adj),True,(0,0,0))
-                    screen.blit(text,(i*cell+5,j*cell+5))
-                elif (i,j) in flags:
-                    pygame.draw.rect(screen,(255,0,0),rect)
+        changed, hint = [], None
+        for action in actions:
+            if not running:
+                break
+            if action == pygame.K_h:
+                kind, hint, p = solver.hint()
+                y, x = divmod(hint, grid_size)
+                text = "safe" if kind == "safe" else f"guess, {p:.0%} mine"
+                pygame.display.set_caption(f"Minesweeper - hint: {x},{y} ({text}, solver {solver.seconds*1000:.1f} ms)")
+                if not (ox <= x < ox+view and oy <= y < oy+view):
+                    ox = min(max(0, x - view//2), grid_size - view)
+                    oy = min(max(0, y - view//2), grid_size - view)
+                    redraw = True
+                continue
+            if action == pygame.K_a:
+                moves, guesses, seconds = solver.solve(rec.step)
+                print(f"Auto-solve: {moves} moves, {guesses} guesses in {seconds*1000:.1f} ms "
+                      f"(solver {solver.seconds*1000:.1f} ms)")
+                redraw = True
+            else:
+                rec.step(action)
+                changed += game.changed
+                solver.update(game.changed)
+            if game.lost:
+                print("Game Over!")
+                running=False
+            elif game.won:
+                print("You Win!")
+                running=False
+        prof.mark("update")
 
-        pygame.display.flip()
-        clock.tick(30)
-    pygame.quit()
+        if redraw:
+            draw_view()
+        else:
+            # Only cells that changed and are on screen get redrawn
+            for c in changed:
+                y, x = divmod(c, grid_size)
+                if ox <= x < ox+view and oy <= y < oy+view:
+                    draw_cell(x-ox, y-oy)
+        if hint is not None:
+            # Outlined until the cell is next drawn
+            y, x = divmod(hint, grid_size)
+            rect = pygame.Rect((x-ox)*cell, (y-oy)*cell, cell, cell)
+            pygame.draw.rect(screen, (255,215,0), rect, 3)
+            renderer.dirty(rect)
+        prof.hud(screen, renderer)
+        renderer.present()
+        prof.mark("render")
+        prof.end()
+    rec.save()
+    prof.export()
+    quit_pygame(pygame)
 
 # -------------------- Hangman --------------------
-def hangman_game():
+HANGMAN_WORDS = ["python","zenpo","hangman","developer","terminal"]
+HANGMAN_LIVES = 6
+HANGMAN_LETTER_ORDER = "etaoinsrhldcumfpgwybvkxjqz"
+HANGMAN_LEVELS = ("easy", "medium", "hard")
+HANGMAN_LENGTHS = (3, 20)
+HANGMAN_INDEX_MAGIC = b"ZHIX"
+HANGMAN_INDEX_VERSION = 1
+HANGMAN_SOURCE = None  # set by zenpo --words
+HANGMAN_DIFFICULTY = None  # set by zenpo --difficulty
+_word_indexes = {}
+
+def word_hardness(word):
+    # Few distinct letters, and rare ones, make a word hard to guess
+    letters = set(word)
+    return sum(HANGMAN_LETTER_ORDER.index(c) for c in letters) / len(letters) - len(letters)
+
+class WordIndex:
+    # A compiled word list, memory-mapped so opening it costs the same for 100
+    # words or 500k. Words are grouped by length; each length bucket holds its
+    # words as fixed-width ASCII, then a bitset per (position, letter) and per
+    # difficulty level where bit k stands for the bucket's k-th word. Narrowing
+    # the candidates after a guess is a few big-int ands, not a rescan.
+    def __init__(self, path):
+        import mmap
+        self.path = path
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.mm[:4] != HANGMAN_INDEX_MAGIC or self.mm[4] != HANGMAN_INDEX_VERSION:
+            raise ValueError(f"{path} is not a zenpo word index")
+        size = int.from_bytes(self.mm[5:9], "little")
+        self.header = json.loads(self.mm[9:9+size])
+        self.source = self.header["source"]
+        self.base = 9 + size
+        self.buckets = {int(length): b for length, b in self.header["buckets"].items()}
+        self._contains = {}
+
+    @staticmethod
+    def compile(words, path, source=None):
+        lo, hi = HANGMAN_LENGTHS
+        words = sorted({w for w in words if lo <= len(w) <= hi and w.isascii() and w.isalpha() and w.islower()},
+                       key=lambda w: (len(w), w))
+        if not words:
+            raise ValueError(f"No usable words in {source or 'word list'}")
+        hardness = sorted(word_hardness(w) for w in words)
+        cuts = (hardness[len(words)//3], hardness[2*len(words)//3])
+        buckets, data = {}, bytearray()
+        for length in sorted({len(w) for w in words}):
+            bucket = [w for w in words if len(w) == length]
+            nbytes = (len(bucket) + 7) // 8
+            bits = [bytearray(nbytes) for _ in range(length*26)]
+            levels = [bytearray(nbytes) for _ in HANGMAN_LEVELS]
+            for k, w in enumerate(bucket):
+                byte, bit = k >> 3, 1 << (k & 7)
+                for pos, c in enumerate(w):
+                    bits[pos*26 + ord(c) - 97][byte] |= bit
+                h = word_hardness(w)
+                levels[(h >= cuts[0]) + (h >= cuts[1])][byte] |= bit
+            buckets[length] = {"count": len(bucket), "bytes": nbytes, "words": len(data)}
+            data += "".join(bucket).encode("ascii")
+            buckets[length]["bits"] = len(data)
+            data += b"".join(bits)
+            buckets[length]["levels"] = len(data)
+            data += b"".join(levels)
+        header = json.dumps({"source": source, "words": len(words), "buckets": buckets}).encode()
+        # Sim workers may build the same index at once: each writes its own
+        # temp file, and losing the rename means another process got there
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(HANGMAN_INDEX_MAGIC + bytes([HANGMAN_INDEX_VERSION]) + len(header).to_bytes(4, "little"))
+            f.write(header)
+            f.write(data)
+        try:
+            os.replace(tmp, path)
+        except OSError:
+            os.remove(tmp)
+            if not os.path.exists(path):
+                raise
+
+    def bitset(self, offset, nbytes):
+        offset += self.base
+        return int.from_bytes(self.mm[offset:offset+nbytes], "little")
+
+    def word(self, length, k):
+        offset = self.base + self.buckets[length]["words"] + k*length
+        return self.mm[offset:offset+length].decode("ascii")
+
+    def at(self, length, pos, letter):
+        b = self.buckets[length]
+        return self.bitset(b["bits"] + (pos*26 + ord(letter) - 97)*b["bytes"], b["bytes"])
+
+    def contains(self, length, letter):
+        key = (length, letter)
+        if key not in self._contains:
+            mask = 0
+            for pos in range(length):
+                mask |= self.at(length, pos, letter)
+            self._contains[key] = mask
+        return self._contains[key]
+
+    def level(self, length, difficulty=None):
+        b = self.buckets[length]
+        if difficulty is None:
+            return (1 << b["count"]) - 1
+        return self.bitset(b["levels"] + HANGMAN_LEVELS.index(difficulty)*b["bytes"], b["bytes"])
+
+    def random_word(self, rng, difficulty=None):
+        lengths = sorted(self.buckets)
+        pools = [self.level(length, difficulty) for length in lengths]
+        i = rng.choices(range(len(lengths)), [bin(p).count("1") for p in pools])[0]
+        while True:
+            k = rng.randrange(self.buckets[lengths[i]]["count"])
+            if pools[i] >> k & 1:
+                return self.word(lengths[i], k)
+
+    def candidates(self, pattern, guessed):
+        # Words matching the revealed letters that contain no wrong guess
+        length = len(pattern)
+        if length not in self.buckets:
+            return 0
+        mask = self.level(length)
+        for pos, p in enumerate(pattern):
+            if p != "_":
+                mask &= self.at(length, pos, p)
+            else:
+                for c in guessed:
+                    mask &= ~self.at(length, pos, c)
+        return mask
+
+    def best_guess(self, pattern, guessed):
+        # The unguessed letter found in the most remaining candidates, so the
+        # guess most likely to hit; returns (letter, candidates left)
+        mask = self.candidates(pattern, guessed)
+        best, best_count = None, -1
+        for c in HANGMAN_LETTER_ORDER:
+            if c in guessed:
+                continue
+            count = bin(mask & self.contains(len(pattern), c)).count("1")
+            if count > best_count:
+                best, best_count = c, count
+        return best, bin(mask).count("1")
+
+def default_word_source():
+    source = HANGMAN_SOURCE or os.environ.get("ZENPO_WORDS")
+    if not source and os.path.exists("/usr/share/dict/words"):
+        source = "/usr/share/dict/words"
+    return source
+
+def load_word_index(source=None):
+    # source is a word list file (one word per line) or None for HANGMAN_WORDS.
+    # The compiled index lives in the cache dir, rebuilt when the file changes.
+    if source:
+        source = os.path.abspath(source)
+        st = os.stat(source)
+        stamp = f"{source}|{st.st_size}|{st.st_mtime_ns}"
+    else:
+        stamp = "|".join(HANGMAN_WORDS)
+    path = os.path.join(cache_dir(), f"hangman-{hashlib.sha1(stamp.encode()).hexdigest()[:12]}.idx")
+    if path not in _word_indexes:
+        if not os.path.exists(path):
+            if source:
+                with open(source, encoding="utf-8", errors="ignore") as f:
+                    words = [line.strip() for line in f]
+            else:
+                words = HANGMAN_WORDS
+            os.makedirs(cache_dir(), exist_ok=True)
+            WordIndex.compile(words, path, source)
+        _word_indexes[path] = WordIndex(path)
+    return _word_indexes[path]
+
+class HangmanGame:
+    # Actions: a single letter. words is a list or a WordIndex.
+    def __init__(self, words=HANGMAN_WORDS, seed=None, difficulty=None):
+        self.words, self.difficulty = words, difficulty
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        if isinstance(self.words, WordIndex):
+            self.word = self.words.random_word(self.rng, self.difficulty)
+        else:
+            self.word = self.rng.choice(self.words)
+        self.guessed = set()
+        self.incorrect = 0
+        return self.observe()
+
+    @property
+    def won(self):
+        return all(c in self.guessed for c in self.word)
+
+    @property
+    def lost(self):
+        return self.incorrect >= HANGMAN_LIVES
+
+    def step(self, action):
+        if self.won or self.lost:
+            return 0, True
+        ch = action.lower()
+        if not ch.isalpha() or ch in self.guessed:
+            return 0, False
+        self.guessed.add(ch)
+        if ch not in self.word:
+            self.incorrect += 1
+            return -1, self.lost
+        return self.word.count(ch), self.won
+
+    def hint(self):
+        # (best next letter, words still possible)
+        pattern, guessed = "".join(c if c in self.guessed else "_" for c in self.word), self.guessed
+        if isinstance(self.words, WordIndex):
+            return self.words.best_guess(pattern, guessed)
+        fits = [w for w in self.words if len(w) == len(pattern)
+                and all(c == p if p != "_" else c not in guessed for c, p in zip(w, pattern))]
+        counts = {}
+        for w in fits:
+            for c in set(w) - guessed:
+                counts[c] = counts.get(c, 0) + 1
+        if counts:
+            return max(counts, key=lambda c: (counts[c], -HANGMAN_LETTER_ORDER.find(c))), len(fits)
+        return next((c for c in HANGMAN_LETTER_ORDER if c not in guessed), None), len(fits)
+
+    def observe(self):
+        return {"pattern": "".join(c if c in self.guessed else "_" for c in self.word),
+                "guessed": sorted(self.guessed), "incorrect": self.incorrect,
+                "won": self.won, "lost": self.lost, "done": self.won or self.lost}
+
+def draw_hangman_status(pygame, screen, font, game, hint=None):
+    # Everything that can change lives in the band below the middle
+    WIDTH, HEIGHT = screen.get_size()
+    area = pygame.Rect(0, HEIGHT//2-20, WIDTH, HEIGHT//2+20)
+    screen.fill((255,255,255), area)
+    display_word = " ".join(game.observe()["pattern"])
+    text = TEXT_CACHE.render(font, display_word, (0,0,0))
+    screen.blit(text,(50,HEIGHT//2-20))
+    text2 = TEXT_CACHE.render(font, f"Incorrect: {game.incorrect}", (255,0,0))
+    screen.blit(text2,(50,HEIGHT//2+20))
+    if game.lost:
+        text3 = TEXT_CACHE.render(font, "You Lost!", (255,0,0))
+        screen.blit(text3,(50,HEIGHT//2+60))
+    if game.won:
+        text3 = TEXT_CACHE.render(font, "You Won!", (0,255,0))
+        screen.blit(text3,(50,HEIGHT//2+60))
+    elif hint and not game.lost:
+        text3 = TEXT_CACHE.render(font, f"Hint: {hint[0]} ({hint[1]} words fit)", (0,0,255))
+        screen.blit(text3,(50,HEIGHT//2+60))
+    return area
+
+def hangman_game(seed=None, event_driven=True, profile=None, words=None, difficulty=None):
+    # Press ? for a hint from the solver
+    index = load_word_index(words or default_word_source())
+    difficulty = difficulty or HANGMAN_DIFFICULTY
+    rec = Recorder("hangman", seed, source=index.source, difficulty=difficulty)
+    game = rec.game
+
+    import pygame
     pygame.init()
-    WIDTH, HEIGHT = 400, 300
+    WIDTH, HEIGHT = max(400, 30*len(game.word) + 100), 300
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Hangman")
-    clock = pygame.time.Clock()
+    renderer = EventRenderer(pygame, screen, event_driven)
+    prof = make_profiler(pygame, "hangman", profile)
     font = pygame.font.SysFont(None, 36)
+    hint = None
 
-    words = ["python","zenpo","hangman","developer","terminal"]
-    word = random.choice(words)
-    guessed = set()
-    incorrect = 0
+    screen.fill((255,255,255))
+    renderer.dirty(screen.get_rect())
+    renderer.dirty(draw_hangman_status(pygame, screen, font, game))
+    renderer.present()
     running = True
-
     while running:
-        screen.fill((255,255,255))
-        for event in pygame.event.get():
+        events = renderer.events()
+        prof.begin()
+        letters, redraw = [], False
+        for event in events:
             if event.type==pygame.QUIT: running=False
-            elif event.type==pygame.KEYDOWN:
-                ch = event.unicode.lower()
-                if ch.isalpha() and ch not in guessed:
-                    guessed.add(ch)
-                    if ch not in word: incorrect+=1
-
-        display_word = " ".join([c if c in guessed else "_" for c in word])
-        text = font.render(display_word, True, (0,0,0))
-        screen.blit(text,(50,HEIGHT//2-20))
-        text2 = font.render(f"Incorrect: {incorrect}", True,(255,0,0))
-        screen.blit(text2,(50,HEIGHT//2+20))
-        if incorrect>=6:
-            text3 = font.render("You Lost!", True,(255,0,0))
-            screen.blit(text3,(50,HEIGHT//2+60))
-        if all(c in guessed for c in word):
-            text3 = font.render("You Won!", True,(0,255,0))
-            screen.blit(text3,(50,HEIGHT//2+60))
+            elif event.type==pygame.VIDEOEXPOSE: redraw = True
+            elif event.type==pygame.KEYDOWN and event.unicode == "?":
+                hint = game.hint()
+                redraw = True
+            elif event.type==pygame.KEYDOWN and len(event.unicode) == 1:
+                letters.append(event.unicode)
+        prof.mark("events")
 
-        pygame.display.flip()
-        clock.tick(30)
-    pygame.quit()
+        guesses = len(game.guessed)
+        for letter in letters:
+            rec.step(letter)
+        if len(game.guessed) != guesses:
+            hint = None
+        prof.mark("update")
+
+        if redraw or len(game.guessed) != guesses:
+            renderer.dirty(draw_hangman_status(pygame, screen, font, game, hint))
+        prof.hud(screen, renderer)
+        renderer.present()
+        prof.mark("render")
+        prof.end()
+    rec.save()
+    prof.export()
+    quit_pygame(pygame)
 
 # -------------------- 2048 --------------------
-def game_2048():
+# The board is a 64-bit int, one nibble per tile holding its exponent (0 is
+# empty, 1 is 2, 2 is 4, ...). Row i is bits 16*i..16*i+15 with column 0 in
+# the low nibble. Moving a row is a lookup in 65536-entry tables; up/down
+# reuse the row tables on the transposed board.
+MOVES_2048 = ("up", "down", "left", "right")
+# Expectimax heuristic weights
+HEUR_LOST_PENALTY = 200000.0
+HEUR_MONOTONICITY_POWER = 4.0
+HEUR_MONOTONICITY_WEIGHT = 47.0
+HEUR_SUM_POWER = 3.5
+HEUR_SUM_WEIGHT = 11.0
+HEUR_MERGES_WEIGHT = 700.0
+HEUR_EMPTY_WEIGHT = 270.0
+
+_tables_2048 = None
+
+def mirror_row(row):
+    return (row >> 12) | ((row >> 4) & 0xF0) | ((row << 4) & 0xF00) | ((row << 12) & 0xF000)
+
+def slide_row(line):
+    # Slide one row (list of 4 exponents) to the left: (new row, points)
+    tiles = [v for v in line if v]
+    out, points, i = [], 0, 0
+    while i < len(tiles):
+        # 0xF is the largest exponent a nibble holds, so those never merge
+        if i+1 < len(tiles) and tiles[i] == tiles[i+1] and tiles[i] != 0xF:
+            out.append(tiles[i]+1)
+            points += 1 << (tiles[i]+1)
+            i += 2
+        else:
+            out.append(tiles[i])
+            i += 1
+    out += [0]*(4-len(out))
+    return out[0] | out[1] << 4 | out[2] << 8 | out[3] << 12, points
+
+def row_heuristic(line):
+    empty = line.count(0)
+    merges, prev, counter = 0, 0, 0
+    for v in line:
+        if v == 0:
+            continue
+        if prev == v:
+            counter += 1
+        elif counter > 0:
+            merges += 1 + counter
+            counter = 0
+        prev = v
+    if counter > 0:
+        merges += 1 + counter
+    mono_left = mono_right = 0.0
+    for a, b in zip(line, line[1:]):
+        pa, pb = a ** HEUR_MONOTONICITY_POWER, b ** HEUR_MONOTONICITY_POWER
+        if a > b:
+            mono_left += pa - pb
+        else:
+            mono_right += pb - pa
+    return (HEUR_LOST_PENALTY + HEUR_EMPTY_WEIGHT*empty + HEUR_MERGES_WEIGHT*merges
+            - HEUR_MONOTONICITY_WEIGHT*min(mono_left, mono_right)
+            - HEUR_SUM_WEIGHT*sum(v ** HEUR_SUM_POWER for v in line))
+
+def tables_2048():
+    # (left, right, left points, right points, heuristic), built once per process
+    global _tables_2048
+    if _tables_2048 is None:
+        left, left_pts, heur = [0]*65536, [0]*65536, [0.0]*65536
+        for row in range(65536):
+            line = [row & 0xF, (row >> 4) & 0xF, (row >> 8) & 0xF, row >> 12]
+            left[row], left_pts[row] = slide_row(line)
+            heur[row] = row_heuristic(line)
+        # A right move is a left move of the mirrored row
+        right = [mirror_row(left[mirror_row(row)]) for row in range(65536)]
+        right_pts = [left_pts[mirror_row(row)] for row in range(65536)]
+        _tables_2048 = (left, right, left_pts, right_pts, heur)
+    return _tables_2048
+
+def transpose_2048(b):
+    a1 = b & 0xF0F00F0FF0F00F0F
+    a2 = b & 0x0000F0F00000F0F0
+    a3 = b & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+def move_2048(board, action):
+    # Returns (new board, points scored)
+    left, right, left_pts, right_pts, _ = tables_2048()
+    vertical = action in ("up", "down")
+    if vertical:
+        board = transpose_2048(board)
+    table, pts = (left, left_pts) if action in ("left", "up") else (right, right_pts)
+    r0, r1, r2, r3 = board & 0xFFFF, (board >> 16) & 0xFFFF, (board >> 32) & 0xFFFF, board >> 48
+    out = table[r0] | table[r1] << 16 | table[r2] << 32 | table[r3] << 48
+    if vertical:
+        out = transpose_2048(out)
+    return out, pts[r0] + pts[r1] + pts[r2] + pts[r3]
+
+def heuristic_2048(board):
+    heur = tables_2048()[4]
+    t = transpose_2048(board)
+    return (heur[board & 0xFFFF] + heur[(board >> 16) & 0xFFFF] + heur[(board >> 32) & 0xFFFF] + heur[board >> 48]
+            + heur[t & 0xFFFF] + heur[(t >> 16) & 0xFFFF] + heur[(t >> 32) & 0xFFFF] + heur[t >> 48])
+
+def empty_cells_2048(board):
+    return [i for i in range(16) if not (board >> 4*i) & 0xF]
+
+class Expectimax2048:
+    # Player nodes take the best move, chance nodes average over every empty
+    # cell getting a 2 (90%) or a 4 (10%). Search stops at `depth` moves or
+    # once a branch is less likely than `min_prob`; chance nodes are cached
+    # per search by board.
+    def __init__(self, depth=2, min_prob=0.0001):
+        self.depth, self.min_prob = depth, min_prob
+        self.cache = {}
+
+    def best_move(self, board):
+        self.cache = {}
+        best, best_value = None, -1.0
+        for action in MOVES_2048:
+            moved = move_2048(board, action)[0]
+            if moved == board:
+                continue
+            value = self.chance(moved, self.depth - 1, 1.0)
+            if value > best_value:
+                best, best_value = action, value
+        return best
+
+    def chance(self, board, depth, prob):
+        if depth <= 0 or prob < self.min_prob:
+            return heuristic_2048(board)
+        cached = self.cache.get(board)
+        if cached is not None and cached[0] >= depth:
+            return cached[1]
+        empties = empty_cells_2048(board)
+        p = prob / len(empties)
+        total = 0.0
+        for i in empties:
+            total += 0.9 * self.player(board | 1 << 4*i, depth, p*0.9)
+            total += 0.1 * self.player(board | 2 << 4*i, depth, p*0.1)
+        value = total / len(empties)
+        self.cache[board] = (depth, value)
+        return value
+
+    def player(self, board, depth, prob):
+        best = 0.0
+        for action in MOVES_2048:
+            moved = move_2048(board, action)[0]
+            if moved != board:
+                best = max(best, self.chance(moved, depth - 1, prob))
+        return best
+
+class Game2048:
+    # Actions: "left", "right", "up", "down"
+    def __init__(self, seed=None):
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.board = 0
+        self.score = 0
+        self.moves = 0
+        self.add_new()
+        self.add_new()
+        return self.observe()
+
+    def add_new(self):
+        empty = empty_cells_2048(self.board)
+        if empty:
+            i = self.rng.choice(empty)
+            self.board |= (1 if self.rng.random()<0.9 else 2) << 4*i
+
+    @property
+    def done(self):
+        return all(move_2048(self.board, a)[0] == self.board for a in MOVES_2048)
+
+    def step(self, action):
+        board, points = move_2048(self.board, action)
+        # Only a move that changes the board spawns a tile
+        if board != self.board:
+            self.board = board
+            self.score += points
+            self.moves += 1
+            self.add_new()
+        return points, self.done
+
+    def autoplay(self, depth=2):
+        action = Expectimax2048(depth).best_move(self.board)
+        if action is None:
+            return 0, True
+        return self.step(action)
+
+    @property
+    def grid(self):
+        return [[1 << e if e else 0 for e in ((self.board >> 4*(4*i+j)) & 0xF for j in range(4))] for i in range(4)]
+
+    def observe(self):
+        return {"grid": self.grid, "score": self.score, "moves": self.moves, "done": self.done}
+
+def draw_2048_tile(pygame, screen, font, value, i, j):
+    rect=pygame.Rect(j*100,i*100,100,100)
+    pygame.draw.rect(screen,(200,200,200),rect)
+    if value:
+        text=TEXT_CACHE.render(font, str(value), (0,0,0))
+        screen.blit(text,(j*100+35,i*100+35))
+    pygame.draw.rect(screen,(0,0,0),rect,2)
+    return rect
+
+def game_2048(seed=None, autoplay=False, event_driven=True, profile=None):
+    import pygame
     pygame.init()
     WIDTH, HEIGHT = 400, 400
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("2048")
-    clock = pygame.time.Clock()
+    # Autoplay has to keep moving without input, so it always ticks
+    renderer = EventRenderer(pygame, screen, event_driven and not autoplay)
+    prof = make_profiler(pygame, "2048", profile)
     font = pygame.font.SysFont(None,36)
 
-    grid = [[0]*4 for _ in range(4)]
+    rec = Recorder("2048", seed)
+    game = rec.game
+    keys = {pygame.K_LEFT: "left", pygame.K_RIGHT: "right", pygame.K_UP: "up", pygame.K_DOWN: "down"}
+    shown = [[None]*4 for _ in range(4)]
 
-    def add_new():
-        empty=[(i,j) for i in range(4) for j in range(4) if grid[i][j]==0]
-        if empty:
-            i,j=random.choice(empty)
-            grid[i][j]=2 if random.random()<0.9 else 4
-
-    def merge_left(row):
-        new=[i for i in row if i!=0]
-        for i in range(len(new)-1):
-            if new[i]==new[i+1]:
-                new[i]*=2
-                new[i+1]=0
-        new=[i for i in new if i!=0]
-        while len(new)<4: new.append(0)
-        return new
-
-    add_new()
-    add_new()
+    def draw_tiles():
+        # Redraw only the tiles whose value changed since the last draw
+        grid = game.grid
+        for i in range(4):
+            for j in range(4):
+                if grid[i][j] == shown[i][j]:
+                    continue
+                shown[i][j] = grid[i][j]
+                renderer.dirty(draw_2048_tile(pygame, screen, font, grid[i][j], i, j))
+
+    screen.fill((255,255,255))
+    draw_tiles()
+    renderer.present()
     running=True
     while running:
-        screen.fill((255,255,255))
-        for event in pygame.event.get():
+        events = renderer.events()
+        prof.begin()
+        moves = []
+        for event in events:
             if event.type==pygame.QUIT: running=False
-            elif event.type==pygame.KEYDOWN:
-                moved=False
-                if event.key==pygame.K_LEFT:
-                    for i in range(4): grid[i]=merge_left(grid[i])
-                    moved=True
-                elif event.key==pygame.K_RIGHT:
-                    for i in range(4): grid[i]=merge_left(grid[i][::-1])[::-1]
-                    moved=True
-                elif event.key==pygame.K_UP:
-                    grid=list(map(list,zip(*grid)))
-                    for i in range(4): grid[i]=merge_left(grid[i])
-                    grid=list(map(list,zip(*grid)))
-                    moved=True
-                elif event.key==pygame.K_DOWN:
-                    grid=list(map(list,zip(*grid)))
-                    for i in range(4): grid[i]=merge_left(grid[i][::-1])[::-1]
-                    grid=list(map(list,zip(*grid)))
-                    moved=True
-                if moved: add_new()
+            elif event.type==pygame.VIDEOEXPOSE:
+                shown = [[None]*4 for _ in range(4)]
+            elif event.type==pygame.KEYDOWN and event.key in keys and not autoplay:
+                moves.append(keys[event.key])
+        prof.mark("events")
 
-        for i in range(4):
-            for j in range(4):
-                rect=pygame.Rect(j*100,i*100,100,100)
-                pygame.draw.rect(screen,(200,200,200),rect)
-                if grid[i][j]:
-                    text=font.render(str(grid[i][j]),True,(0,0,0))
-                    screen.blit(text,(j*100+35,i*100+35))
-                pygame.draw.rect(screen,(0,0,0),rect,2)
+        for move in moves:
+            rec.step(move)
+        if autoplay and not game.done:
+            rec.autoplay()
+        prof.mark("update")
+
+        draw_tiles()
+        prof.hud(screen, renderer)
+        renderer.present()
+        prof.mark("render")
+        prof.end()
+    rec.save()
+    prof.export()
+    quit_pygame(pygame)
+
+# -------------------- Replay --------------------
+# Every game run is recorded as its seed plus the stream of engine actions,
+# each stored as (ms since start, action): a varint tick delta, an action code
+# byte and varint arguments, so a minute of Snake is about a kilobyte. The
+# header carries the game parameters and a hash of the final observe(), which
+# `zenpo replay` checks after running the actions through a fresh engine.
+REPLAY_MAGIC = b"ZREC"
+REPLAY_VERSION = 1
+REPLAY_KEEP = 50
+REPLAY_ACTIONS = (("tick", 0), ("up", 0), ("down", 0), ("left", 0), ("right", 0), ("rotate", 0),
+                  ("drop", 0), ("auto", 0), ("cell", 2), ("reveal", 2), ("flag", 2), ("place", 2),
+                  ("key", 1))
+REPLAY_CODES = {name: code for code, (name, _) in enumerate(REPLAY_ACTIONS)}
+
+REPLAY_GAMES = {
+    "snake": lambda seed, p: SnakeGame(p["width"], p["height"], seed),
+    "battleship": lambda seed, p: BattleshipGame(p["grid_size"], p["mode"], tuple(p["fleet"]), seed),
+    "tetris": lambda seed, p: TetrisGame(p["width"], p["height"], seed),
+    "minesweeper": lambda seed, p: MinesweeperGame(p["grid_size"], p["mine_count"], seed),
+    "hangman": lambda seed, p: (HangmanGame(load_word_index(p["source"]), seed, p["difficulty"])
+                                if "source" in p else HangmanGame(seed=seed)),
+    "2048": lambda seed, p: Game2048(seed),
+}
+
+def pack_varint(n):
+    out = bytearray()
+    while n >= 0x80:
+        out.append(n & 0x7F | 0x80)
+        n >>= 7
+    out.append(n)
+    return out
+
+def unpack_varint(data, pos):
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+def pack_action(action):
+    # None is a gravity/clock tick, (x, y) a clicked cell, one char a key press
+    if action is None:
+        name, args = "tick", ()
+    elif isinstance(action, tuple):
+        name, args = ("cell", action) if isinstance(action[0], int) else (action[0], action[1:])
+    elif action in REPLAY_CODES:
+        name, args = action, ()
+    else:
+        name, args = "key", (ord(action),)
+    out = bytearray([REPLAY_CODES[name]])
+    for a in args:
+        out += pack_varint(a)
+    return out
+
+def unpack_events(data):
+    events, pos, tick = [], 0, 0
+    while pos < len(data):
+        delta, pos = unpack_varint(data, pos)
+        tick += delta
+        name, nargs = REPLAY_ACTIONS[data[pos]]
+        pos += 1
+        args = []
+        for _ in range(nargs):
+            a, pos = unpack_varint(data, pos)
+            args.append(a)
+        if name == "tick": action = None
+        elif name == "cell": action = tuple(args)
+        elif name == "key": action = chr(args[0])
+        elif nargs: action = (name, *args)
+        else: action = name
+        events.append((tick, action))
+    return events
+
+def state_hash(game):
+    def canonical(value):
+        if isinstance(value, dict):
+            return sorted((repr(k), canonical(v)) for k, v in value.items())
+        if isinstance(value, (set, frozenset)):
+            return sorted(canonical(v) for v in value)
+        if isinstance(value, (list, tuple)):
+            return [canonical(v) for v in value]
+        return value
+    return hashlib.sha256(repr(canonical(game.observe())).encode()).hexdigest()[:16]
+
+def apply_action(game, action):
+    return game.autoplay() if action == "auto" else game.step(action)
+
+class Recorder:
+    # Front-ends build their engine through a Recorder and send every action
+    # through step()/autoplay() so the run can be saved and replayed
+    def __init__(self, name, seed=None, **params):
+        self.name, self.params = name, params
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self.game = REPLAY_GAMES[name](self.seed, params)
+        self.data = bytearray()
+        self.count = self.last = 0
+        self.start = time.perf_counter()
+
+    def record(self, action):
+        tick = int((time.perf_counter() - self.start)*1000)
+        self.data += pack_varint(tick - self.last)
+        self.data += pack_action(action)
+        self.last = tick
+        self.count += 1
+
+    def step(self, action=None):
+        self.record(action)
+        return self.game.step(action)
+
+    def autoplay(self):
+        self.record("auto")
+        return self.game.autoplay()
+
+    def save(self, path=None):
+        if not self.count:
+            return None
+        if path is None:
+            folder = os.path.join(cache_dir(), "replays")
+            os.makedirs(folder, exist_ok=True)
+            old = sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.endswith(".zrec"))
+            for f in old[:max(0, len(old) - REPLAY_KEEP + 1)]:
+                os.remove(f)
+            path = os.path.join(folder, f"{time.strftime('%Y%m%d-%H%M%S')}-{self.name}.zrec")
+        header = json.dumps({"game": self.name, "seed": self.seed, "params": self.params,
+                             "events": self.count, "ms": self.last, "hash": state_hash(self.game)}).encode()
+        with open(path, "wb") as f:
+            f.write(REPLAY_MAGIC + bytes([REPLAY_VERSION]) + len(header).to_bytes(4, "little"))
+            f.write(header)
+            f.write(self.data)
+        print(f"Replay saved to {path}")
+        return path
+
+def read_replay(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != REPLAY_MAGIC or data[4] != REPLAY_VERSION:
+        raise ValueError(f"{path} is not a zenpo replay")
+    size = int.from_bytes(data[5:9], "little")
+    header = json.loads(data[9:9+size])
+    return header, unpack_events(data[9+size:])
+
+def replay_view(pygame, name, game):
+    # Window size and a full-frame draw for each game, matching the front-ends
+    if name == "snake":
+        block = max(1, min(20, 1000//game.width, 800//game.height))
+        font = pygame.font.SysFont(None, 36)
+        return (game.width*block, game.height*block), lambda screen: draw_snake(pygame, screen, font, game, block)
+    if name == "battleship":
+        n = game.grid_size
+        cell = max(8, 500//n)
+        def draw(screen):
+            for i in range(n):
+                for j in range(n):
+                    draw_battleship_cell(pygame, screen, game, cell, i, j)
+        return (n*cell, n*cell), draw
+    if name == "tetris":
+        return (game.width*20, game.height*20), lambda screen: draw_tetris(pygame, screen, game, 20)
+    if name == "minesweeper":
+        n = game.grid_size
+        cell = max(16, 400//n)
+        view = min(n, 800//cell)
+        font = pygame.font.SysFont(None, 24)
+        def draw(screen):
+            for i in range(view):
+                for j in range(view):
+                    draw_minesweeper_cell(pygame, screen, font, game, j*n + i, pygame.Rect(i*cell, j*cell, cell, cell))
+        return (view*cell, view*cell), draw
+    if name == "hangman":
+        font = pygame.font.SysFont(None, 36)
+        def draw(screen):
+            screen.fill((255,255,255))
+            draw_hangman_status(pygame, screen, font, game)
+        return (max(400, 30*len(game.word) + 100), 300), draw
+    font = pygame.font.SysFont(None, 36)
+    def draw(screen):
+        for i, row in enumerate(game.grid):
+            for j, value in enumerate(row):
+                draw_2048_tile(pygame, screen, font, value, i, j)
+    return (400, 400), draw
+
+def replay(path, headless=False, speed=1.0):
+    header, events = read_replay(path)
+    name = header["game"]
+    game = REPLAY_GAMES[name](header["seed"], header["params"])
+    print(f"Replaying {name} (seed {header['seed']}, {len(events)} events, {header['ms']/1000:.1f}s recorded)")
+    if headless:
+        start = time.perf_counter()
+        for _, action in events:
+            apply_action(game, action)
+    else:
+        import pygame
+        pygame.init()
+        size, draw = replay_view(pygame, name, game)
+        screen = pygame.display.set_mode(size)
+        pygame.display.set_caption(f"Replay: {name}")
+        draw(screen)
         pygame.display.flip()
-        clock.tick(30)
-    pygame.quit()
+        start = time.perf_counter()
+        for tick, action in events:
+            wait = start + tick/1000/speed - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                quit_pygame(pygame)
+                print("Replay stopped.")
+                return False
+            apply_action(game, action)
+            draw(screen)
+            pygame.display.flip()
+        quit_pygame(pygame)
+    elapsed = time.perf_counter() - start
+    digest = state_hash(game)
+    ok = digest == header["hash"]
+    print(f"Ran {len(events)} events in {elapsed*1000:.1f} ms ({len(events)/max(elapsed, 1e-9):,.0f} events/s)")
+    if ok:
+        print(Fore.GREEN + f"Final state hash {digest} matches" + Style.RESET_ALL)
+    else:
+        print(Fore.RED + f"Final state hash {digest} != recorded {header['hash']}" + Style.RESET_ALL)
+    return ok
+
+# -------------------- Terminal Backend --------------------
+# curses versions of every game for SSH and other places without SDL. They
+# share the engines, Recorder and FixedStepLoop with the pygame front-ends
+# and never import pygame.
+GAME_BACKEND = None  # "window" or "terminal", set by zenpo --terminal / --window
+TERMINAL_FPS = 60
+
+def use_terminal():
+    # Explicit choice wins; otherwise a Linux box with no display gets the terminal
+    if GAME_BACKEND:
+        return GAME_BACKEND == "terminal"
+    return sys.platform.startswith("linux") and not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+class TerminalScreen:
+    # Frame buffer over a curses window. Games build each frame with put() and
+    # text(); present() writes only the cells that differ from what is already
+    # on the terminal, so a mostly static board costs a few bytes per update.
+    def __init__(self, stdscr):
+        import curses
+        self.curses, self.win = curses, stdscr
+        if hasattr(curses, "set_escdelay"):
+            # Esc quits; don't wait a second to tell it from an arrow key
+            curses.set_escdelay(25)
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass
+        stdscr.keypad(True)
+        self.colours = {"reverse": curses.A_REVERSE, "bold": curses.A_BOLD}
+        if curses.has_colors():
+            curses.start_color()
+            curses.use_default_colors()
+            for k, name in enumerate(("green", "red", "cyan", "magenta", "yellow", "blue"), 1):
+                curses.init_pair(k, getattr(curses, "COLOR_" + name.upper()), -1)
+                self.colours[name] = curses.color_pair(k)
+        self.arrows = {curses.KEY_UP: "up", curses.KEY_DOWN: "down", curses.KEY_LEFT: "left", curses.KEY_RIGHT: "right"}
+        self.shown, self.frame = {}, {}
+
+    def put(self, y, x, ch, colour=None):
+        self.frame[(y, x)] = (ch, self.colours.get(colour, 0))
+
+    def text(self, y, x, s, colour=None):
+        attr = self.colours.get(colour, 0)
+        for i, ch in enumerate(s):
+            self.frame[(y, x+i)] = (ch, attr)
+
+    def present(self):
+        h, w = self.win.getmaxyx()
+        changed = 0
+        for (y, x) in self.shown.keys() - self.frame.keys():
+            if y < h and x < w - (y == h-1):
+                self.win.addstr(y, x, " ")
+                changed += 1
+        for (y, x), (ch, attr) in self.frame.items():
+            # curses can't write the bottom-right cell without scrolling
+            if self.shown.get((y, x)) != (ch, attr) and y < h and x < w - (y == h-1):
+                self.win.addstr(y, x, ch, attr)
+                changed += 1
+        self.shown, self.frame = self.frame, {}
+        if changed:
+            self.win.refresh()
+        return changed
+
+    def keys(self, timeout=0):
+        # Wait up to `timeout` ms for the first key, then take whatever else
+        # is already queued; -1 waits for a key
+        keys = []
+        self.win.timeout(timeout)
+        k = self.win.getch()
+        while k != -1:
+            self.win.timeout(0)
+            if k == self.curses.KEY_RESIZE:
+                self.win.clear()
+                self.shown = {}
+            elif k == 27:
+                # A lone Esc is a key press; Esc followed by more bytes is an
+                # escape sequence curses didn't know, which we skip
+                k = self.win.getch()
+                if k == -1:
+                    keys.append(27)
+                    break
+                while k != -1 and not (64 <= k <= 126 and k not in (79, 91)):
+                    k = self.win.getch()
+            else:
+                keys.append(k)
+            k = self.win.getch()
+        return keys
+
+    def wait(self, message):
+        self.text(0, 0, message, "bold")
+        self.present()
+        self.keys(-1)
+
+def quit_key(key, letters=False):
+    # ESC always quits; q too unless the game takes letters
+    return key == 27 or (not letters and key in (ord("q"), ord("Q")))
+
+def snake_terminal(term, seed=None, width=30, height=20):
+    rec = Recorder("snake", seed, width=width, height=height)
+    game = rec.game
+    loop = FixedStepLoop(None, SNAKE_HZ, distinct=True)
+    steps = 1
+    while True:
+        for key in term.keys(1000//TERMINAL_FPS):
+            if quit_key(key):
+                return rec, f"Score: {game.score}"
+            if key in term.arrows:
+                loop.push(term.arrows[key])
+        if steps:
+            term.text(0, 0, f"Score: {game.score}   arrows move, q quits")
+            for x in range(-1, width+1):
+                term.text(1, 2*x+2, "--")
+                term.text(height+2, 2*x+2, "--")
+            for y in range(height):
+                term.put(y+2, 0, "|")
+                term.put(y+2, 2*width+3, "|")
+            for k, i in enumerate(game.body):
+                term.text(i // width + 2, 2*(i % width) + 2, "@@" if k == 0 else "[]", "green")
+            if game.food is not None:
+                term.text(game.food // width + 2, 2*(game.food % width) + 2, "<>", "red")
+            term.present()
+        steps = loop.steps()
+        for _ in range(steps):
+            if rec.step(loop.pop())[1]:
+                term.wait(f"Game over! Score: {game.score}   (any key)")
+                return rec, f"Game over! Score: {game.score}"
+
+def tetris_terminal(term, seed=None, autoplay=False):
+    rec = Recorder("tetris", seed, width=10, height=20)
+    game = rec.game
+    loop = FixedStepLoop(None, TETRIS_GRAVITY_HZ, buffer=16)
+    keys = {"left": "left", "right": "right", "down": "down", "up": "rotate"}
+    changed = True
+    while True:
+        for key in term.keys(1000//TERMINAL_FPS):
+            if quit_key(key):
+                return rec, f"Lines: {game.lines}"
+            if key in term.arrows and not autoplay:
+                loop.push(keys[term.arrows[key]])
+            elif key == ord(" ") and not autoplay:
+                loop.push("drop")
+        actions = loop.drain()
+        for action in actions:
+            rec.step(action)
+        steps = loop.steps()
+        for _ in range(steps):
+            if autoplay:
+                rec.autoplay()
+            else:
+                rec.step(None)
+            if game.done:
+                break
+        if game.done:
+            term.wait(f"Game over! Lines: {game.lines}   (any key)")
+            return rec, f"Game over! Lines: {game.lines}"
+        if changed or actions or steps:
+            changed = False
+            term.text(0, 0, f"Lines: {game.lines}   arrows, space drops, q quits")
+            w = game.width
+            for y in range(game.height):
+                term.put(y+1, 0, "|")
+                term.put(y+1, 2*w+1, "|")
+                row = (game.board >> (y*w)) & game.full_row
+                for x in range(w):
+                    if row >> x & 1:
+                        term.text(y+1, 2*x+1, "[]", "cyan")
+            term.text(game.height+1, 0, "+" + "--"*w + "+")
+            for x, y in game.rotations[game.kind][game.rotation].cells:
+                term.text(game.y+y+1, 2*(game.x+x)+1, "[]", "magenta")
+            term.present()
+
+def battleship_terminal(term, seed=None, grid_size=10, fleet=BATTLESHIP_FLEET):
+    # vs AI: your shots on the left, the AI's on your fleet on the right
+    rec = Recorder("battleship", seed, grid_size=grid_size, mode="ai", fleet=list(fleet))
+    game = rec.game
+    n = grid_size
+    cx = cy = 0
+    status = "arrows aim, space fires, q quits"
+    while True:
+        term.text(0, 0, status.ljust(2*n*2 + 6))
+        term.text(1, 0, "Enemy".ljust(2*n+4) + "Your fleet")
+        for y in range(n):
+            for x in range(n):
+                c = (x, y)
+                if c in game.shots[0]:
+                    mark, colour = ("XX", "green") if c in game.ship_at[1] else ("..", None)
+                else:
+                    mark, colour = "~~", "blue"
+                term.text(y+2, 2*x, mark, "reverse" if (x, y) == (cx, cy) else colour)
+                if c in game.shots[1]:
+                    mark, colour = ("XX", "red") if c in game.ship_at[0] else ("..", None)
+                else:
+                    mark, colour = ("##", None) if c in game.ship_at[0] else ("~~", "blue")
+                term.text(y+2, 2*n + 4 + 2*x, mark, colour)
+        term.present()
+        if game.winner is not None:
+            message = "You win!" if game.winner == 0 else "AI wins!"
+            term.wait(f"{message}   (any key)".ljust(2*n*2 + 6))
+            return rec, message
+        for key in term.keys(-1):
+            if quit_key(key):
+                return rec, None
+            if key in term.arrows:
+                dx, dy = SNAKE_DIRECTIONS[term.arrows[key]]
+                cx, cy = min(max(0, cx+dx), n-1), min(max(0, cy+dy), n-1)
+            elif key in (ord(" "), 10, 13):
+                rec.step((cx, cy))
+                sunk = [p for p, _, result in game.changed if result == "sunk"]
+                status = ("You sank a ship!" if 0 in sunk else "AI sank a ship!" if 1 in sunk
+                          else "arrows aim, space fires, q quits")
+
+def minesweeper_terminal(term, seed=None, grid_size=8, mine_count=None):
+    rec = Recorder("minesweeper", seed, grid_size=grid_size, mine_count=mine_count)
+    game = rec.game
+    solver = MinesweeperSolver(game)
+    n = grid_size
+    cx = cy = 0
+    status = "arrows, space reveals, f flags, h hints, a solves, q quits"
+    while True:
+        # Big boards scroll to keep the cursor in view
+        h, w = term.win.getmaxyx()
+        vw, vh = min(n, max(1, (w-1)//2)), min(n, max(1, h-2))
+        ox, oy = min(max(0, cx - vw//2), n - vw), min(max(0, cy - vh//2), n - vh)
+        term.text(0, 0, f"Mines: {game.mine_count}   {status}".ljust(w-1))
+        for y in range(oy, oy+vh):
+            for x in range(ox, ox+vw):
+                i = y*n + x
+                if game.revealed[i]:
+                    mark, colour = (str(game.counts[i]) if game.counts[i] else "."), "cyan"
+                elif game.flags[i]:
+                    mark, colour = "F", "red"
+                elif game.lost and game.mines[i]:
+                    mark, colour = "*", "red"
+                else:
+                    mark, colour = "#", None
+                term.text(y-oy+1, 2*(x-ox), mark + " ", "reverse" if (x, y) == (cx, cy) else colour)
+        term.present()
+        if game.lost or game.won:
+            message = "You win!" if game.won else "Game over!"
+            term.wait(f"{message}   (any key)".ljust(w-1))
+            return rec, message
+        for key in term.keys(-1):
+            if quit_key(key):
+                return rec, None
+            if key in term.arrows:
+                dx, dy = SNAKE_DIRECTIONS[term.arrows[key]]
+                cx, cy = min(max(0, cx+dx), n-1), min(max(0, cy+dy), n-1)
+            elif key in (ord(" "), 10, 13):
+                rec.step(("reveal", cx, cy))
+                solver.update(game.changed)
+            elif key in (ord("f"), ord("F")):
+                rec.step(("flag", cx, cy))
+            elif key in (ord("h"), ord("H")):
+                kind, hint, p = solver.hint()
+                cy, cx = divmod(hint, n)
+                text = "safe" if kind == "safe" else f"guess, {p:.0%} mine"
+                status = f"hint: {text} (solver {solver.seconds*1000:.1f} ms)"
+            elif key in (ord("a"), ord("A")):
+                moves, guesses, seconds = solver.solve(rec.step)
+                status = f"solved: {moves} moves, {guesses} guesses, {seconds*1000:.1f} ms"
+                break
+
+def hangman_terminal(term, seed=None, words=None, difficulty=None):
+    index = load_word_index(words or default_word_source())
+    difficulty = difficulty or HANGMAN_DIFFICULTY
+    rec = Recorder("hangman", seed, source=index.source, difficulty=difficulty)
+    game = rec.game
+    hint = None
+    while True:
+        term.text(0, 0, "Type letters, ? for a hint, Esc quits")
+        term.text(2, 2, " ".join(game.observe()["pattern"]), "bold")
+        term.text(4, 2, f"Incorrect: {game.incorrect}/{HANGMAN_LIVES}", "red")
+        term.text(5, 2, "Guessed: " + " ".join(sorted(game.guessed)))
+        if hint:
+            term.text(7, 2, f"Hint: {hint[0]} ({hint[1]} words fit)", "cyan")
+        term.present()
+        if game.won or game.lost:
+            message = "You won!" if game.won else f"You lost! The word was {game.word}"
+            term.wait(f"{message}   (any key)".ljust(40))
+            return rec, message
+        for key in term.keys(-1):
+            if quit_key(key, letters=True):
+                return rec, None
+            if key == ord("?"):
+                hint = game.hint()
+            elif 0 < key < 256 and chr(key).isalpha():
+                rec.step(chr(key))
+                hint = None
+
+def game_2048_terminal(term, seed=None, autoplay=False):
+    rec = Recorder("2048", seed)
+    game = rec.game
+    colours = {2: None, 4: None, 8: "yellow", 16: "yellow", 32: "red", 64: "red", 128: "magenta",
+               256: "magenta", 512: "green", 1024: "green", 2048: "cyan"}
+    while True:
+        term.text(0, 0, f"Score: {game.score}   arrows move, q quits".ljust(40))
+        for i, row in enumerate(game.grid):
+            term.text(2*i+1, 0, "+------"*4 + "+")
+            for j, value in enumerate(row):
+                term.put(2*i+2, 7*j, "|")
+                term.text(2*i+2, 7*j+1, f"{value or '':^6}", colours.get(value, "bold"))
+            term.put(2*i+2, 28, "|")
+        term.text(9, 0, "+------"*4 + "+")
+        term.present()
+        if game.done:
+            term.wait(f"Game over! Score: {game.score}   (any key)".ljust(40))
+            return rec, f"Game over! Score: {game.score}"
+        for key in term.keys(1000//TERMINAL_FPS if autoplay else -1):
+            if quit_key(key):
+                return rec, f"Score: {game.score}"
+            if key in term.arrows and not autoplay:
+                rec.step(term.arrows[key])
+        if autoplay:
+            rec.autoplay()
+
+TERMINAL_GAMES = {
+    "snake": snake_terminal,
+    "battleship": battleship_terminal,
+    "tetris": tetris_terminal,
+    "minesweeper": minesweeper_terminal,
+    "hangman": hangman_terminal,
+    "2048": game_2048_terminal,
+}
+
+def terminal_game(name, seed=None, **options):
+    import curses
+    rec, message = curses.wrapper(lambda stdscr: TERMINAL_GAMES[name](TerminalScreen(stdscr), seed, **options))
+    rec.save()
+    if message:
+        print(message)
 
 # -------------------- Game Panel ------------------------------------------
 def launch_game_panel():
@@ -414,14 +3048,20 @@ def launch_game_panel():
     print("[5] Hangman")
     print("[6] 2048")
 
-    choice = input("Select a game: ").strip()
-    if choice=='1': snake_game()
-    elif choice=='2': battleship_game()
-    elif choice=='3': tetris_game()
-    elif choice=='4': minesweeper_game()
-    elif choice=='5': hangman_game()
-    elif choice=='6': game_2048()
-    else: print("Unknown choice")
+    games = {'1': ("snake", snake_game), '2': ("battleship", battleship_game), '3': ("tetris", tetris_game),
+             '4': ("minesweeper", minesweeper_game), '5': ("hangman", hangman_game), '6': ("2048", game_2048)}
+    try:
+        choice = input("Select a game (add t to play in the terminal, e.g. 3t): ").strip().lower()
+    except EOFError:
+        return
+    terminal = choice.endswith("t") or use_terminal()
+    choice = choice.rstrip("t")
+    if choice not in games:
+        print("Unknown choice")
+    elif terminal:
+        terminal_game(games[choice][0])
+    else:
+        games[choice][1]()
 
 # -------------------- WhatsApp Messaging --------------------
 def whatsapp_message():
@@ -436,37 +3076,326 @@ def whatsapp_message():
     except Exception as e:
         print(f"Failed to send message: {e}")
 
+# -------------------- Bulk Messaging --------------------
+class MessageTransport:
+    # Backend for send_bulk(): send() returns when the message is out and
+    # raises on failure.
+    async def send(self, phone, message):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+class PyWhatKitTransport(MessageTransport):
+    def __init__(self, wait_time=15):
+        import pywhatkit
+        self.pywhatkit, self.wait_time = pywhatkit, wait_time
+
+    async def send(self, phone, message):
+        # pywhatkit blocks while it drives a browser tab, keep it off the loop
+        import asyncio
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: self.pywhatkit.sendwhatmsg_instantly(phone, message, self.wait_time, True))
+
+class FileTransport(MessageTransport):
+    # Appends every message to a JSONL file instead of sending it. fail_rate
+    # and latency fake a flaky, slow backend for testing retries/throughput.
+    def __init__(self, path, fail_rate=0.0, latency=0.0, seed=None):
+        self.file = open(path, "a", encoding="utf-8")
+        self.fail_rate, self.latency = fail_rate, latency
+        self.rng = random.Random(seed)
+
+    async def send(self, phone, message):
+        import asyncio
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.rng.random() < self.fail_rate:
+            raise ConnectionError("simulated send failure")
+        self.file.write(json.dumps({"phone": phone, "message": message, "time": time.time()}) + "\n")
+        self.file.flush()
+
+    async def close(self):
+        self.file.close()
+
+def read_messages(path):
+    # Yields (id, phone, message) from a CSV with phone,message columns or a
+    # JSONL file of {"phone": ..., "message": ...}; an "id" field is optional.
+    # Without one the id is a hash of phone and message (plus how many times
+    # that pair came before), so adding or reordering rows doesn't change it
+    seen = {}
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            import csv
+            rows = csv.DictReader(f)
+            missing = [c for c in ("phone", "message") if c not in (rows.fieldnames or ())]
+            if missing:
+                raise ValueError(f"{path} has no {' or '.join(missing)} column")
+        for n, row in enumerate(rows, 1):
+            missing = [c for c in ("phone", "message") if c not in row]
+            if missing:
+                raise ValueError(f"{path} row {n} has no {' or '.join(missing)}")
+            phone, message = row["phone"].strip(), row["message"]
+            msg_id = row.get("id")
+            if not msg_id:
+                key = hashlib.sha1(f"{phone}\n{message}".encode()).hexdigest()[:16]
+                seen[key] = seen.get(key, 0) + 1
+                msg_id = key if seen[key] == 1 else f"{key}-{seen[key]}"
+            yield str(msg_id), phone, message
+
+class RateLimiter:
+    def __init__(self, per_second):
+        self.interval = 1.0/per_second if per_second else 0.0
+        self.next_at = 0.0
+        self.lock = None
+
+    async def wait(self):
+        import asyncio
+        if not self.interval:
+            return
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            now = time.monotonic()
+            if self.next_at > now:
+                await asyncio.sleep(self.next_at - now)
+            self.next_at = max(now, self.next_at) + self.interval
+
+async def send_bulk_async(path, transport, rate=1.0, retries=3, backoff=2.0, concurrency=1, progress_path=None):
+    import asyncio
+    progress_path = progress_path or path + ".progress.jsonl"
+    done = set()
+    if os.path.exists(progress_path):
+        with open(progress_path, encoding="utf-8") as f:
+            done = {r["id"] for r in map(json.loads, filter(str.strip, f)) if r["status"] == "sent"}
+    stats = {"sent": 0, "failed": 0, "skipped": 0, "retries": 0}
+    limiter = RateLimiter(rate)
+    queue = asyncio.Queue(maxsize=concurrency*2)
+    progress = open(progress_path, "a", encoding="utf-8")
+    start = time.perf_counter()
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            msg_id, phone, message = item
+            status, error = "failed", None
+            for attempt in range(retries + 1):
+                if attempt:
+                    stats["retries"] += 1
+                    await asyncio.sleep(backoff * 2**(attempt-1))
+                await limiter.wait()
+                try:
+                    await transport.send(phone, message)
+                    status = "sent"
+                    break
+                except Exception as e:
+                    error = str(e)
+            stats[status] += 1
+            progress.write(json.dumps({"id": msg_id, "status": status, "error": error}) + "\n")
+            progress.flush()
+            handled = stats["sent"] + stats["failed"]
+            if handled % 50 == 0:
+                print(f"  {handled} handled, {handled/(time.perf_counter()-start):.1f} msg/s")
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+    try:
+        for item in read_messages(path):
+            if item[0] in done:
+                stats["skipped"] += 1
+                continue
+            await queue.put(item)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        progress.close()
+        await transport.close()
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    stats["per_second"] = round((stats["sent"] + stats["failed"]) / stats["seconds"], 2) if stats["seconds"] else 0.0
+    return stats
+
+def send_bulk(path, transport="pywhatkit", outbox="outbox.jsonl", **options):
+    import asyncio
+    print(f"=== Bulk messaging from {path} ===")
+    try:
+        backend = PyWhatKitTransport() if transport == "pywhatkit" else FileTransport(outbox)
+        stats = asyncio.run(send_bulk_async(path, backend, **options))
+    except Exception as e:
+        print(f"Bulk send failed: {e}")
+        return 1
+    print(Fore.GREEN + f"Sent {stats['sent']}" + Style.RESET_ALL +
+          f", failed {stats['failed']}, skipped {stats['skipped']} (already sent), retries {stats['retries']}")
+    print(f"{stats['seconds']:.1f}s, {stats['per_second']} msg/s")
+    return 0 if not stats["failed"] else 1
+
+# -------------------- Launcher --------------------
+class Launch:
+    def __init__(self, launch_id, key, desc, cmd, shell=False, capture=False, timeout=None):
+        self.id, self.key, self.desc, self.cmd = launch_id, key, desc, cmd
+        self.shell, self.capture, self.timeout = shell, capture, timeout
+        self.status = "queued"  # queued, running, exited, killed, timeout, failed
+        self.proc = None
+        self.pid = None
+        self.exit_code = None
+        self.output = None
+        self.error = None
+        self.queued_at = time.time()
+        self.started = self.ended = None
+
+    @property
+    def runtime(self):
+        if self.started is None:
+            return 0.0
+        return (self.ended or time.time()) - self.started
+
+    def as_dict(self):
+        return {"id": self.id, "key": self.key, "desc": self.desc, "cmd": self.cmd, "pid": self.pid,
+                "status": self.status, "exit_code": self.exit_code, "seconds": round(self.runtime, 3),
+                "queued_seconds": round((self.started or self.queued_at) - self.queued_at, 3),
+                "output": self.output, "error": self.error}
+
+class AppLauncher:
+    # Starts panel commands in the background so the input loop never waits
+    # on a child. At most `max_running` run at once; the rest queue and start
+    # as slots free up. Each running child has a watcher thread that waits on
+    # it (collecting output if captured) and enforces its timeout.
+    def __init__(self, max_running=4):
+        self.max_running = max_running
+        self.launches = []
+        self.queue = deque()
+        self.running = 0
+        self.lock = threading.Lock()
+        self.finished = threading.Condition(self.lock)
+
+    def launch(self, key, desc, cmd, shell=False, capture=False, timeout=None):
+        with self.lock:
+            launch = Launch(len(self.launches)+1, key, desc, cmd, shell, capture, timeout)
+            self.launches.append(launch)
+            self.queue.append(launch)
+            self.start_queued()
+        return launch
+
+    def start_queued(self):
+        # Caller holds self.lock
+        while self.queue and self.running < self.max_running:
+            launch = self.queue.popleft()
+            if launch.capture:
+                io = {"stdin": subprocess.DEVNULL, "stdout": subprocess.PIPE, "stderr": subprocess.STDOUT}
+            elif os.name == "nt":
+                # cmd/powershell need a console of their own to stay open
+                io = {"creationflags": subprocess.CREATE_NEW_CONSOLE}
+            else:
+                io = {}
+            launch.started = time.time()
+            try:
+                launch.proc = subprocess.Popen(launch.cmd, shell=launch.shell, text=launch.capture, **io)
+            except Exception as e:
+                launch.status, launch.error, launch.ended = "failed", str(e), time.time()
+                self.finished.notify_all()
+                continue
+            launch.pid = launch.proc.pid
+            launch.status = "running"
+            self.running += 1
+            threading.Thread(target=self.watch, args=(launch,), daemon=True).start()
+
+    def watch(self, launch):
+        try:
+            out, _ = launch.proc.communicate(timeout=launch.timeout)
+        except subprocess.TimeoutExpired:
+            launch.proc.kill()
+            out, _ = launch.proc.communicate()
+            with self.lock:
+                # kill() may have got there first
+                if launch.status == "running":
+                    launch.status = "timeout"
+        with self.lock:
+            launch.ended = time.time()
+            launch.exit_code = launch.proc.returncode
+            launch.output = out
+            if launch.status == "running":
+                launch.status = "exited"
+            self.running -= 1
+            self.start_queued()
+            self.finished.notify_all()
+
+    def kill(self, launch_id):
+        # True if a queued or running launch was stopped
+        with self.lock:
+            launch = next((l for l in self.launches if l.id == launch_id), None)
+            if launch is None:
+                return False
+            if launch.status == "queued":
+                self.queue.remove(launch)
+                launch.status = "killed"
+                self.finished.notify_all()
+            elif launch.status == "running":
+                launch.status = "killed"
+                launch.proc.kill()
+            else:
+                return False
+        return True
+
+    def active(self):
+        with self.lock:
+            return [l for l in self.launches if l.status in ("queued", "running")]
+
+    def wait(self):
+        with self.lock:
+            while self.running or self.queue:
+                self.finished.wait()
+
+    def print_table(self):
+        if not self.launches:
+            print("Nothing launched yet")
+            return
+        print(Style.BRIGHT + f"{'ID':>3}  {'KEY':<4}{'PID':>7}  {'STATUS':<8}{'TIME':>8}  {'EXIT':>4}  APP")
+        for l in list(self.launches):
+            code = "" if l.exit_code is None else l.exit_code
+            colour = Fore.GREEN if l.status == "running" else Fore.YELLOW if l.status == "queued" else ""
+            print(colour + f"{l.id:>3}  {l.key:<4}{l.pid or '':>7}  {l.status:<8}{l.runtime:>7.1f}s  {code:>4}  {l.desc}")
+
 # -------------------- Control Panel --------------------
+HOTKEYS = {
+    "GM": ("Interactive Game Mode [V2-BETA]", None),
+    "W": ("Send Message [NEW]", None),
+    "X": ("Exit the panel", None),
+    "T": ("Open Task Manager", ["taskmgr"]),
+    "C": ("Open CMD", ["cmd"]),
+    "P": ("Open PowerShell", ["powershell"]),
+    "Q": ("Open Control Panel", ["control"]),
+    "N": ("Open Notepad", ["notepad"]),
+    "B": ("Open default Browser", ["start", ""], True),
+    "E": ("Open Explorer", ["explorer"]),
+    "M": ("Open Microsoft Store", ["start", "ms-windows-store:"], True),
+    "S": ("Open Settings", ["start", "ms-settings:"], True),
+    "H": ("Open Hosts file in Notepad", ["notepad", r"C:\Windows\System32\drivers\etc\hosts"]),
+    "L": ("Lock Workstation", ["rundll32.exe", "user32.dll,LockWorkStation"]),
+    "R": ("Run custom script [NOT FUNCTIONAL]", ["C:\\path\\to\\yourscript.bat"]),
+    "V": ("Open Registry Editor", ["regedit"]),
+    "D": ("Open Event Viewer", ["eventvwr.msc"]),
+    "K": ("Open Task Scheduler", ["taskschd.msc"]),
+    "G": ("Quick Network Test (ping 8.8.8.8)", ["cmd", "/c", "ping 8.8.8.8"]),
+    "F": ("Open Paint", ["mspaint"]),
+    "A": ("Open Calculator", ["calc"]),
+    "Y": ("Search Files", ["explorer", "shell:::{2559a1f3-21d7-11d4-bdaf-00c04f60b9f0}"]),
+    "J": ("Show running apps", None),
+    "JK": ("Kill a running app (JK <id>)", None),
+    "JO": ("Show captured output (JO <id>)", None),
+    "JC": ("Toggle output capture for new launches", None),
+    "=": ("Credits", None)
+}
+
 def show_panel():
     print(ascii_banner("PANEL"))
     print(Fore.LIGHTBLUE_EX + "A general control panel for apps\n")
     print("Press different keys to open apps:\n")
 
-    hotkeys = {
-        "GM": ("Interactive Game Mode [V2-BETA]", None),
-        "W": ("Send Message [NEW]", None),
-        "X": ("Exit the panel", None),
-        "T": ("Open Task Manager", ["taskmgr"]),
-        "C": ("Open CMD", ["cmd"]),
-        "P": ("Open PowerShell", ["powershell"]),
-        "Q": ("Open Control Panel", ["control"]),
-        "N": ("Open Notepad", ["notepad"]),
-        "B": ("Open default Browser", ["start", ""], True),
-        "E": ("Open Explorer", ["explorer"]),
-        "M": ("Open Microsoft Store", ["start", "ms-windows-store:"], True),
-        "S": ("Open Settings", ["start", "ms-settings:"], True),
-        "H": ("Open Hosts file in Notepad", ["notepad", r"C:\Windows\System32\drivers\etc\hosts"]),
-        "L": ("Lock Workstation", ["rundll32.exe", "user32.dll,LockWorkStation"]),
-        "R": ("Run custom script [NOT FUNCTIONAL]", ["C:\\path\\to\\yourscript.bat"]),
-        "V": ("Open Registry Editor", ["regedit"]),
-        "D": ("Open Event Viewer", ["eventvwr.msc"]),
-        "K": ("Open Task Scheduler", ["taskschd.msc"]),
-        "G": ("Quick Network Test (ping 8.8.8.8)", ["cmd", "/c", "ping 8.8.8.8"]),
-        "F": ("Open Paint", ["mspaint"]),
-        "A": ("Open Calculator", ["calc"]),
-        "Y": ("Search Files", ["explorer", "shell:::{2559a1f3-21d7-11d4-bdaf-00c04f60b9f0}"]),
-        "=": ("Credits", None)
-    }
+    hotkeys = HOTKEYS
+    launcher = AppLauncher()
+    capture = False
 
     tree_text = r"""
 ==================== ZENPO CREDITS ====================
@@ -491,7 +3420,11 @@ Email any suggestions to: zenpo.a00137@gmail.com
 
     # Main input loop
     while True:
-        choice = input("Choice: ").strip().upper()
+        try:
+            choice, *args = input("Choice: ").strip().upper().split() or [""]
+        except EOFError:
+            print("Exiting panel...")
+            break
         if choice not in hotkeys:
             print("Unknown option")
             continue
@@ -506,26 +3439,540 @@ Email any suggestions to: zenpo.a00137@gmail.com
         elif choice == "=":
             print(tree_text)
             continue
+        elif choice == "J":
+            launcher.print_table()
+        elif choice in ("JK", "JO"):
+            launch = launcher.launches[int(args[0])-1] if args and args[0].isdigit() and 0 < int(args[0]) <= len(launcher.launches) else None
+            if launch is None:
+                print(f"Usage: {choice} <id> (see J for ids)")
+            elif choice == "JK":
+                if launcher.kill(launch.id):
+                    print(f"Killed {launch.desc} [#{launch.id}]")
+                else:
+                    print(f"{launch.desc} [#{launch.id}] is not running ({launch.status})")
+            elif launch.output is None:
+                print("No captured output" + (" yet" if launch.capture and launch.status == "running" else ""))
+            else:
+                print(launch.output)
+        elif choice == "JC":
+            capture = not capture
+            print(f"Output capture {'on' if capture else 'off'}")
         elif choice == "X":
+            running = len(launcher.active())
+            if running:
+                print(f"{running} app(s) still running in the background")
             print("Exiting panel...")
             break
         elif cmd:
-            try:
-                subprocess.run(cmd, shell=shell_flag)
-            except Exception as e:
-                print(f"Failed to run {desc}: {e}")
+            launch = launcher.launch(choice, desc, cmd, shell_flag, capture)
+            if launch.status == "failed":
+                print(f"Failed to run {desc}: {launch.error}")
+            elif launch.status == "queued":
+                print(f"Queued {desc} [#{launch.id}]")
+            else:
+                print(f"Started {desc} [#{launch.id}, pid {launch.pid}]")
+
+# -------------------- Batch Mode --------------------
+def run_batch(keys, parallel=4, timeout=None, as_json=False):
+    # Non-interactive panel: run hotkey actions as one concurrent batch and
+    # report timings and exit codes. Returns the process exit code.
+    keys = [k.strip().upper() for k in keys if k.strip()]
+    bad = [k for k in keys if k not in HOTKEYS or not HOTKEYS[k][1]]
+    if bad or not keys:
+        print(f"Not runnable in batch mode: {', '.join(bad) or '(no keys)'}", file=sys.stderr)
+        return 2
+
+    launcher = AppLauncher(max_running=max(1, parallel))
+    start = time.perf_counter()
+    for key in keys:
+        desc, cmd, *rest = HOTKEYS[key]
+        launcher.launch(key, desc, cmd, rest[0] if rest else False, capture=True, timeout=timeout)
+    launcher.wait()
+    total = time.perf_counter() - start
+
+    results = [l.as_dict() for l in launcher.launches]
+    ok = all(r["status"] == "exited" and r["exit_code"] == 0 for r in results)
+    if as_json:
+        print(json.dumps({"ok": ok, "parallel": parallel, "timeout": timeout,
+                          "total_seconds": round(total, 3), "results": results}, indent=2))
+    else:
+        launcher.print_table()
+        print(f"\n{len(results)} action(s) in {total:.2f}s - " + (Fore.GREEN + "all ok" if ok else Fore.RED + "some failed"))
+    return 0 if ok else 1
 
 # -------------------- Refresh --------------------
-def refresh_package():
+REFRESH_CACHE_FILE = "refresh.json"
+# A reinstall is only needed when one of these changes
+INSTALL_FILES = ("setup.py", "requirements.txt")
+
+def install_hash(pkg_dir):
+    h = hashlib.sha256()
+    for name in INSTALL_FILES:
+        h.update(name.encode() + b"\0")
+        try:
+            with open(os.path.join(pkg_dir, name), "rb") as f:
+                h.update(f.read())
+        except OSError:
+            h.update(b"missing")
+    return h.hexdigest()
+
+def git_output(pkg_dir, *args):
+    return subprocess.run(["git", *args], cwd=pkg_dir, check=True, capture_output=True, text=True).stdout.strip()
+
+def refresh_package(pkg_dir=None, install_cmd=None):
+    # Fetch first and stop if we're already at upstream with the install
+    # files unchanged; otherwise pull, and only re-run pip when setup.py or
+    # requirements.txt differ from what was last installed.
+    timings = {}
+    start = clock = time.perf_counter()
+    def lap(name):
+        nonlocal clock
+        now = time.perf_counter()
+        timings[name] = now - clock
+        clock = now
     try:
-        import zenpo
-        pkg_dir = os.path.dirname(zenpo.__file__)
+        if pkg_dir is None:
+            import zenpo
+            pkg_dir = os.path.dirname(zenpo.__file__)
+        pkg_dir = os.path.abspath(pkg_dir)
+        if install_cmd is None:
+            install_cmd = [sys.executable, "-m", "pip", "install", "-e", "."]
         print(f"Refreshing Zenpo in {pkg_dir}...\n")
-        subprocess.run(["git", "pull"], cwd=pkg_dir, check=True)
-        subprocess.run([sys.executable, "-m", "pip", "install", "-e", "."], cwd=pkg_dir, check=True)
-        print("\nZenpo has been updated successfully!")
+
+        subprocess.run(["git", "fetch", "--quiet"], cwd=pkg_dir, check=True)
+        lap("fetch")
+        local = git_output(pkg_dir, "rev-parse", "HEAD")
+        try:
+            upstream = git_output(pkg_dir, "rev-parse", "@{u}")
+        except subprocess.CalledProcessError:
+            upstream = None  # no tracking branch, just pull like before
+        installed = load_cache_json(REFRESH_CACHE_FILE, {})
+        lap("compare")
+
+        if local == upstream and installed.get(pkg_dir) == install_hash(pkg_dir):
+            print(f"Already up to date ({local[:7]}), nothing to do.")
+        else:
+            if local != upstream:
+                subprocess.run(["git", "pull"], cwd=pkg_dir, check=True)
+                lap("pull")
+            current = install_hash(pkg_dir)
+            if installed.get(pkg_dir) == current:
+                print("setup.py and requirements.txt unchanged, skipping reinstall.")
+            else:
+                subprocess.run(install_cmd, cwd=pkg_dir, check=True)
+                installed[pkg_dir] = current
+                save_cache_json(REFRESH_CACHE_FILE, installed)
+                lap("install")
+            print("\nZenpo has been updated successfully!")
     except Exception as e:
         print(f"Failed to refresh Zenpo: {e}")
+    timings["total"] = time.perf_counter() - start
+    print("Timing: " + ", ".join(f"{k} {v:.2f}s" for k, v in timings.items()))
+    return timings
+
+# -------------------- Startup Profile --------------------
+HEAVY_MODULES = ("pygame", "pyfiglet", "pywhatkit")
+
+def startup_profile(argv, top=15):
+    # Re-run the same command in a fresh interpreter under -X importtime so we
+    # measure a real cold start, not whatever this process already imported.
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = here + (os.pathsep + env["PYTHONPATH"] if env.get("PYTHONPATH") else "")
+    code = f"import zenpo; zenpo.main({argv!r})"
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env,
+                          stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                          stderr=subprocess.PIPE, text=True)
+    wall = time.perf_counter() - start
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        try:
+            self_us, cum_us = int(self_us), int(cum_us)
+        except ValueError:
+            continue  # column header
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), self_us, cum_us, depth))
+    if not rows:
+        print(f"No import timings captured (exit code {proc.returncode})")
+        return 1
+
+    total_us = sum(r[1] for r in rows)
+    loaded = {r[0].split(".")[0] for r in rows}
+    label = " ".join(argv) if argv else "(help)"
+    print(Style.BRIGHT + f"Startup profile: zenpo {label}")
+    print(f"Wall time: {wall*1000:.1f} ms   Imports: {len(rows)} modules, {total_us/1000:.1f} ms\n")
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for name, self_us, cum_us, _ in sorted((r for r in rows if r[3] == 0), key=lambda r: -r[2])[:top]:
+        print(f"{cum_us/1000:>9.1f} ms {self_us/1000:>7.1f} ms  {name}")
+    print()
+    for mod in HEAVY_MODULES:
+        state = Fore.RED + "loaded" if mod in loaded else Fore.GREEN + "not loaded"
+        print(f"{mod:<10} " + state)
+    return proc.returncode
+
+# -------------------- Bench --------------------
+# Random-action drivers for the headless step benchmark: (new game, pick action)
+BENCH_GAMES = {
+    "snake": (lambda: SnakeGame(), lambda g, rng: rng.choice(("up", "down", "left", "right", None))),
+    "tetris": (lambda: TetrisGame(), lambda g, rng: rng.choice(("left", "right", "rotate", "down", None, None))),
+    "minesweeper": (lambda: MinesweeperGame(16, 40),
+                    lambda g, rng: (rng.choice(("reveal", "reveal", "flag")), rng.randrange(g.grid_size), rng.randrange(g.grid_size))),
+    "hangman": (lambda: HangmanGame(), lambda g, rng: rng.choice("abcdefghijklmnopqrstuvwxyz")),
+    "2048": (lambda: Game2048(), lambda g, rng: rng.choice(MOVES_2048)),
+    "battleship": (lambda: BattleshipGame(), lambda g, rng: (rng.randrange(g.grid_size), rng.randrange(g.grid_size))),
+}
+
+def bench_startup(runs=5):
+    # Median wall time of a fresh interpreter running each path of main()
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    env["PYTHONPATH"] = here + (os.pathsep + env["PYTHONPATH"] if env.get("PYTHONPATH") else "")
+    paths = {
+        "help": ("import zenpo; zenpo.main([])", ""),
+        "panel": ("import zenpo; zenpo.main(['-p'])", "X\n"),
+        # The game path ends with pygame up and a window open
+        "game": ("import zenpo, pygame; pygame.init(); pygame.display.set_mode((200, 200))", ""),
+    }
+    results = {}
+    for name, (code, stdin) in paths.items():
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], input=stdin, text=True, env=env,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            times.append(time.perf_counter() - start)
+        results[f"startup.{name}_ms"] = sorted(times)[len(times)//2] * 1000
+    return results
+
+def bench_steps(seconds=0.5):
+    # Headless steps per second of each engine under random actions
+    results = {}
+    for name, (make, pick) in BENCH_GAMES.items():
+        rng = random.Random(0)
+        game, seed, steps = make(), 0, 0
+        game.reset(seed)
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            for _ in range(100):
+                if game.step(pick(game, rng))[1]:
+                    seed += 1
+                    game.reset(seed)
+            steps += 100
+        results[f"steps.{name}_per_s"] = steps / (time.perf_counter() - start)
+    return results
+
+def bench_render(frames=200):
+    # Full-frame draw + flip per game under SDL's dummy video driver
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    try:
+        import pygame
+    except ImportError:
+        print("pygame not installed, skipping render benchmarks")
+        return {}
+    pygame.init()
+    font = pygame.font.SysFont(None, 36)
+    rng = random.Random(0)
+
+    snake = SnakeGame(seed=0)
+    for _ in range(50): snake.step(rng.choice(("up", "left")))
+    tetris = TetrisGame(seed=0)
+    for _ in range(30): tetris.autoplay()
+    mines = MinesweeperGame(8, 10, seed=0)
+    for i in range(64):
+        if not mines.mines[i] and mines.counts[i] == 0:
+            mines.step(("reveal", i % 8, i // 8))
+            break
+    hangman = HangmanGame(seed=0)
+    for ch in "etaon": hangman.step(ch)
+    g2048 = Game2048(seed=0)
+    for _ in range(100): g2048.step(rng.choice(MOVES_2048))
+    ships = BattleshipGame(seed=0)
+    for _ in range(30): ships.step((rng.randrange(10), rng.randrange(10)))
+
+    scenes = {
+        "snake": ((600, 400), lambda screen: draw_snake(pygame, screen, font, snake, 20)),
+        "tetris": ((200, 400), lambda screen: draw_tetris(pygame, screen, tetris, 20)),
+        "minesweeper": ((400, 400), lambda screen: [draw_minesweeper_cell(pygame, screen, font, mines, j*8+i, pygame.Rect(i*50, j*50, 50, 50))
+                                                    for i in range(8) for j in range(8)]),
+        "hangman": ((400, 300), lambda screen: draw_hangman_status(pygame, screen, font, hangman)),
+        "2048": ((400, 400), lambda screen: [draw_2048_tile(pygame, screen, font, v, i, j)
+                                             for i, row in enumerate(g2048.grid) for j, v in enumerate(row)]),
+        "battleship": ((500, 500), lambda screen: [draw_battleship_cell(pygame, screen, ships, 50, i, j)
+                                                   for i in range(10) for j in range(10)]),
+    }
+    results = {}
+    TEXT_CACHE.hits = TEXT_CACHE.misses = 0
+    for name, (size, draw) in scenes.items():
+        screen = pygame.display.set_mode(size)
+        start = time.perf_counter()
+        for _ in range(frames):
+            draw(screen)
+            pygame.display.flip()
+        results[f"render.{name}_ms"] = (time.perf_counter() - start) / frames * 1000
+    results["render.text_cache_hit_rate"] = TEXT_CACHE.stats()["hit_rate"]
+    quit_pygame(pygame)
+    return results
+
+def bench_banner(runs=20):
+    global _banner_memory, _banner_disk
+    import tempfile
+    saved = os.environ.get("ZENPO_CACHE_DIR"), _banner_memory, _banner_disk
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ["ZENPO_CACHE_DIR"] = tmp
+            _banner_memory, _banner_disk = {}, None
+            ascii_banner("warm up")  # keep the pyfiglet import out of the numbers
+            start = time.perf_counter()
+            for i in range(runs):
+                ascii_banner(f"Zenpo {i}")
+            results["banner.render_ms"] = (time.perf_counter() - start) / runs * 1000
+
+            start = time.perf_counter()
+            for i in range(runs):
+                _banner_memory, _banner_disk = {}, None
+                ascii_banner(f"Zenpo {i}")
+            results["banner.disk_ms"] = (time.perf_counter() - start) / runs * 1000
+
+            start = time.perf_counter()
+            for i in range(runs*100):
+                ascii_banner("Zenpo 0")
+            results["banner.memory_us"] = (time.perf_counter() - start) / (runs*100) * 1e6
+    finally:
+        env, _banner_memory, _banner_disk = saved
+        if env is None:
+            os.environ.pop("ZENPO_CACHE_DIR", None)
+        else:
+            os.environ["ZENPO_CACHE_DIR"] = env
+    return results
+
+def compare_bench(results, baseline, threshold):
+    # Metrics ending in _per_s or _rate should go up, everything else (times) down
+    regressions = []
+    for key, value in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        change = (base - value)/base if key.endswith(("_per_s", "_rate")) else (value - base)/base
+        if change > threshold:
+            regressions.append((key, base, value, change))
+    return regressions
+
+def run_bench(output="bench.json", baseline=None, save_baseline=False, threshold=0.15, quick=False):
+    print(ascii_banner("Bench"))
+    results = {}
+    for label, fn, arg in (("startup", bench_startup, 3 if quick else 7),
+                           ("engine steps", bench_steps, 0.2 if quick else 1.0),
+                           ("rendering", bench_render, 50 if quick else 300),
+                           ("banner", bench_banner, 5 if quick else 20)):
+        print(f"Running {label} benchmarks...")
+        results.update(fn(arg))
+
+    report = {"version": VERSION, "python": sys.version.split()[0], "platform": sys.platform,
+              "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    base = {}
+    if baseline and os.path.exists(baseline) and not save_baseline:
+        with open(baseline, encoding="utf-8") as f:
+            base = json.load(f)["results"]
+    regressions = {r[0]: r for r in compare_bench(results, base, threshold)}
+
+    print()
+    for key, value in results.items():
+        line = f"{key:<28}{value:>14,.2f}"
+        if key in base:
+            line += f"   base {base[key]:>12,.2f}"
+        print((Fore.RED + line + "  REGRESSION") if key in regressions else line)
+    print(f"\nResults written to {output}")
+    if save_baseline and baseline:
+        with open(baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved as baseline {baseline}")
+    if regressions:
+        print(Fore.RED + f"{len(regressions)} metric(s) regressed more than {threshold:.0%}")
+        return 1
+    return 0
+
+# -------------------- Simulation --------------------
+# A bot is a factory bot(game, rng) called once per game; it returns act(),
+# which gives the next action (or "auto" for the engine's own autoplay).
+# --bot takes a built-in name or "module:function" for a bot of your own.
+def snake_bot(game, rng):
+    # Greedy: head for the food, never into a wall or the body
+    w, h = game.width, game.height
+    def act():
+        y, x = divmod(game.body[0], w)
+        fy, fx = divmod(game.food, w) if game.food is not None else (y, x)
+        best, best_dist = None, None
+        for name, (dx, dy) in SNAKE_DIRECTIONS.items():
+            if game.direction == (-dx, -dy):
+                continue
+            nx, ny = x+dx, y+dy
+            if not (0 <= nx < w and 0 <= ny < h) or game.occupied[ny*w + nx]:
+                continue
+            dist = abs(fx-nx) + abs(fy-ny) + rng.random()*0.5
+            if best is None or dist < best_dist:
+                best, best_dist = name, dist
+        return best
+    return act
+
+def battleship_bot(game, rng):
+    # Player 0 hunts with its own BattleshipAI, fed from game.changed
+    ai = BattleshipAI(game.grid_size, game.fleet, rng)
+    def act():
+        for player, cell, result in game.changed:
+            if player == 0:
+                ai.record(cell, result, game.ships[1][game.ship_at[1][cell]] if result == "sunk" else None)
+        return ai.next_shot()
+    return act
+
+def minesweeper_bot(game, rng):
+    # MinesweeperSolver: deduce safe cells, guess the least likely mine
+    solver = MinesweeperSolver(game)
+    def act():
+        solver.update(game.changed)
+        return solver.next_action()
+    return act
+
+def hangman_bot(game, rng):
+    # The solver's hint: the letter in the most words that still fit
+    return lambda: game.hint()[0]
+
+def game_2048_bot(game, rng):
+    # One-ply expectimax: much faster than autoplay()'s default depth
+    search = Expectimax2048(depth=1)
+    def act():
+        return search.best_move(game.board) or "left"
+    return act
+
+SIM_GAMES = {
+    # name: (new game from seed and options, built-in bots, metrics of a finished game)
+    "snake": (lambda seed, o: SnakeGame(o.get("width", 30), o.get("height", 20), seed), {"ai": snake_bot},
+              lambda g: {"score": g.score, "ticks": g.ticks}),
+    "battleship": (lambda seed, o: BattleshipGame(seed=seed), {"ai": battleship_bot},
+                   lambda g: {"shots": len(g.shots[0]), "won": g.winner == 0}),
+    "tetris": (lambda seed, o: TetrisGame(seed=seed), {"ai": lambda g, rng: lambda: "auto"},
+               lambda g: {"lines": g.lines, "pieces": g.pieces_placed}),
+    "minesweeper": (lambda seed, o: MinesweeperGame(o.get("grid_size", 8), o.get("mine_count"), seed), {"ai": minesweeper_bot},
+                    lambda g: {"revealed": g.revealed_count, "won": g.won}),
+    "hangman": (lambda seed, o: HangmanGame(load_word_index(o.get("words")), seed, o.get("difficulty")),
+                {"ai": hangman_bot},
+                lambda g: {"incorrect": g.incorrect, "won": g.won}),
+    "2048": (lambda seed, o: Game2048(seed), {"ai": game_2048_bot},
+             lambda g: {"score": g.score, "max_tile": max(max(row) for row in g.grid), "moves": g.moves}),
+}
+
+def sim_bot(name, bot):
+    if bot == "random":
+        pick = BENCH_GAMES[name][1]
+        return lambda game, rng: lambda: pick(game, rng)
+    if ":" in bot:
+        import importlib
+        module, func = bot.split(":", 1)
+        return getattr(importlib.import_module(module), func)
+    bots = SIM_GAMES[name][1]
+    if bot not in bots:
+        raise ValueError(f"Unknown bot {bot!r} for {name} (built-in: random, {', '.join(bots)})")
+    return bots[bot]
+
+def sim_chunk(name, bot, seeds, max_steps, options):
+    # Runs in a worker process: play one game per seed, return their metrics.
+    # Settings come in options, not module globals, which spawned workers
+    # never see
+    make, _, metrics = SIM_GAMES[name]
+    policy = sim_bot(name, bot)
+    results = []
+    for seed in seeds:
+        game = make(seed, options)
+        # Separate stream from the game's own rng, which shares the seed
+        act = policy(game, random.Random(f"bot{seed}"))
+        steps, done = 0, False
+        while not done and steps < max_steps:
+            done = apply_action(game, act())[1]
+            steps += 1
+        results.append(dict(metrics(game), steps=steps, seed=seed))
+    return results
+
+def percentile(values, q):
+    return values[min(len(values)-1, int(len(values)*q))]
+
+def summarize_sim(results):
+    summary = {}
+    for key in results[0]:
+        if key == "seed":
+            continue
+        values = sorted(r[key] for r in results)
+        if isinstance(values[0], bool):
+            summary[key] = {"rate": sum(values) / len(values)}
+        else:
+            summary[key] = {"mean": sum(values) / len(values), "min": values[0], "p50": percentile(values, 0.5),
+                            "p90": percentile(values, 0.9), "p99": percentile(values, 0.99), "max": values[-1]}
+    return summary
+
+def print_histogram(values, bins=10, width=40):
+    lo, hi = min(values), max(values)
+    size = max((hi - lo) / bins, 1)
+    counts = [0]*bins
+    for v in values:
+        counts[min(bins-1, int((v - lo) / size))] += 1
+    top = max(counts)
+    for k, count in enumerate(counts):
+        if lo + k*size > hi:
+            break
+        print(f"  {lo + k*size:>10.0f} | {'#' * round(width*count/top):<{width}} {count}")
+
+def run_sim(name, games=1000, workers=None, bot="ai", seed=0, max_steps=20000, as_json=False, **options):
+    # options are game settings (width/height, grid_size/mine_count,
+    # words/difficulty); each game reads the ones it knows
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    if name not in SIM_GAMES:
+        print(Fore.RED + f"Unknown game {name!r}, pick one of: {', '.join(SIM_GAMES)}" + Style.RESET_ALL)
+        return 2
+    if games < 1:
+        print(Fore.RED + "Need at least one game" + Style.RESET_ALL)
+        return 2
+    sim_bot(name, bot)  # fail fast on a bad --bot before starting workers
+    options = {k: v for k, v in options.items() if v is not None}
+    if name == "hangman":
+        options["words"] = options.get("words") or default_word_source()
+        # Compile the index once here rather than in every worker
+        load_word_index(options["words"])
+    workers = workers or os.cpu_count() or 1
+    # Small chunks keep every worker busy to the end and progress flowing
+    chunk = max(1, min(100, games // (workers*8)))
+    seeds = range(seed, seed + games)
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(sim_chunk, name, bot, seeds[i:i+chunk], max_steps, options) for i in range(0, games, chunk)]
+        for future in as_completed(futures):
+            results += future.result()
+            if not as_json:
+                rate = len(results) / (time.perf_counter() - start)
+                print(f"\r{len(results)}/{games} games  {rate:,.1f} games/s", end="", flush=True)
+    elapsed = time.perf_counter() - start
+    results.sort(key=lambda r: r["seed"])
+    summary = summarize_sim(results)
+    if as_json:
+        print(json.dumps({"game": name, "bot": bot, "games": games, "workers": workers,
+                          "seconds": elapsed, "summary": summary}, indent=2))
+        return 0
+
+    print(f"\n\n{name} x{games} with bot {bot!r} on {workers} workers: {elapsed:.2f}s ({games/elapsed:,.1f} games/s)")
+    for key, stats in summary.items():
+        print("  " + f"{key:<10}" + "  ".join(f"{k} {v:,.3g}" if k != "rate" else f"rate {v:.1%}" for k, v in stats.items()))
+    main_key = next(k for k in results[0] if k != "seed")
+    if not isinstance(results[0][main_key], bool):
+        print(f"\n{main_key} histogram:")
+        print_histogram([r[main_key] for r in results])
+    return 0
 
 # -------------------- Main --------------------
 def show_main():
@@ -536,15 +3983,116 @@ def show_main():
     print(Style.BRIGHT + "Help:")
     print("        zenpo -p\tShow panel with apps to open")
     print("        zenpo -refresh\tUpdate Zenpo to latest GitHub version")
+    print("        zenpo -p --run T,G,N [--parallel 4] [--timeout S] [--json]\tRun panel actions as a batch")
+    print("        zenpo --send FILE [--transport pywhatkit|file] [--rate N]\tSend messages from a CSV/JSONL file")
+    print("        zenpo -p --profile [FILE]\tFrame-time HUD in games, trace written to FILE (.json/.csv)")
+    print("        zenpo bench [--baseline FILE] [--save-baseline]\tBenchmark startup, games and rendering")
+    print("        zenpo replay FILE [--headless] [--speed X]\tReplay a recorded game and check its final state")
+    print("        zenpo sim --game NAME --games N [--workers K] [--bot ai|random|mod:fn]\tSimulate games on all cores")
+    print("        zenpo -p --words FILE [--difficulty easy|medium|hard]\tHangman with your own word list")
+    print("        zenpo serve [--host H] [--port P]\tHost online Battleship matches")
+    print("        zenpo battleship [--connect HOST[:PORT]] [--match NAME]\tPlay Battleship (online with --connect)")
+    print("        zenpo snake [--size N | --width W --height H]\tSnake on any board size, e.g. 500x500")
+    print("        zenpo minesweeper [--size N] [--mines M] [--solve]\tMinesweeper on any board size, or time the solver")
+    print("        zenpo -p --terminal\tPlay games in the terminal with curses (works over SSH, no SDL)")
+    print("        zenpo --startup-profile [args]\tShow import time per module for a command")
     print("        zenpo\tShow this text")
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(prog="zenpo", add_help=False)
+    parser.add_argument("command", nargs="?", choices=["bench", "replay", "sim", "serve", "battleship", "minesweeper", "snake"], help="Subcommand to run")
+    parser.add_argument("file", nargs="?", help="Recording for replay")
     parser.add_argument("-p", action="store_true", help="Show panel with apps to open")
     parser.add_argument("-refresh", action="store_true", help="Update Zenpo to latest GitHub version")
-    args = parser.parse_args()
+    parser.add_argument("--startup-profile", action="store_true", help="Report import time per module")
+    parser.add_argument("--run", metavar="KEYS", help="Comma-separated panel keys to run without prompting")
+    parser.add_argument("--parallel", type=int, default=4, help="Max actions running at once with --run")
+    parser.add_argument("--timeout", type=float, help="Seconds before a --run action is killed")
+    parser.add_argument("--json", action="store_true", help="Print --run results as JSON")
+    parser.add_argument("--send", metavar="FILE", help="Send every message in a CSV/JSONL file")
+    parser.add_argument("--transport", choices=["pywhatkit", "file"], default="pywhatkit", help="Backend for --send")
+    parser.add_argument("--outbox", default="outbox.jsonl", help="Where the file transport writes messages")
+    parser.add_argument("--rate", type=float, default=1.0, help="Max messages per second for --send")
+    parser.add_argument("--retries", type=int, default=3, help="Retries per message for --send")
+    parser.add_argument("--concurrency", type=int, default=1, help="Messages in flight at once for --send")
+    parser.add_argument("--output", default="bench.json", help="Where bench writes its JSON results")
+    parser.add_argument("--baseline", help="Bench results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this bench run as --baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Relative change bench flags as a regression")
+    parser.add_argument("--quick", action="store_true", help="Shorter bench run")
+    parser.add_argument("--profile", nargs="?", const="zenpo-trace.json", metavar="FILE",
+                        help="Show a frame-time HUD in games and write a trace (.json or .csv)")
+    parser.add_argument("--headless", action="store_true", help="Replay without graphics, as fast as possible")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed for replay")
+    parser.add_argument("--game", default="2048", help="Game for sim: snake, battleship, tetris, minesweeper, hangman, 2048")
+    parser.add_argument("--games", type=int, default=1000, help="Number of games for sim")
+    parser.add_argument("--workers", type=int, help="Worker processes for sim (default: one per core)")
+    parser.add_argument("--bot", default="ai", help="Sim bot: ai, random or module:function")
+    parser.add_argument("--seed", type=int, help="Game seed (first seed for sim, default 0)")
+    parser.add_argument("--words", metavar="FILE", help="Word list for hangman, one word per line")
+    parser.add_argument("--difficulty", choices=HANGMAN_LEVELS, help="Only pick hangman words of this difficulty")
+    parser.add_argument("--host", default="127.0.0.1", help="Address zenpo serve listens on")
+    parser.add_argument("--port", type=int, default=BATTLESHIP_PORT, help="Port zenpo serve listens on")
+    parser.add_argument("--connect", metavar="HOST[:PORT]", help="Battleship server to play online against")
+    parser.add_argument("--match", default="", help="Online match name to join (default: next free opponent)")
+    parser.add_argument("--terminal", action="store_const", const="terminal", dest="backend",
+                        help="Play games in the terminal (curses) instead of a window")
+    parser.add_argument("--window", action="store_const", const="window", dest="backend",
+                        help="Always play games in a pygame window")
+    parser.add_argument("--max-steps", type=int, default=20000, help="Step limit per simulated game")
+    parser.add_argument("--size", type=int, help="Board width and height for minesweeper (default 8) and snake")
+    parser.add_argument("--width", type=int, help="Snake board width (default 30)")
+    parser.add_argument("--height", type=int, help="Snake board height (default 20)")
+    parser.add_argument("--mines", type=int, help="Minesweeper mine count (default: 10 per 64 cells)")
+    parser.add_argument("--solve", action="store_true", help="Let the minesweeper solver play headlessly and time it")
+    args = parser.parse_args(argv)
+
+    global PROFILE_PATH, HANGMAN_SOURCE, HANGMAN_DIFFICULTY, BATTLESHIP_SERVER, BATTLESHIP_MATCH, GAME_BACKEND
+    PROFILE_PATH, GAME_BACKEND = args.profile, args.backend
+    HANGMAN_SOURCE, HANGMAN_DIFFICULTY = args.words, args.difficulty
+    BATTLESHIP_SERVER = args.connect or BATTLESHIP_SERVER
+    BATTLESHIP_MATCH = args.match
 
-    if args.refresh:
+    if args.startup_profile:
+        argv = sys.argv[1:] if argv is None else list(argv)
+        sys.exit(startup_profile([a for a in argv if a != "--startup-profile"]))
+    elif args.command == "bench":
+        sys.exit(run_bench(args.output, args.baseline, args.save_baseline, args.threshold, args.quick))
+    elif args.command == "replay":
+        if not args.file:
+            parser.error("replay needs a recording FILE")
+        sys.exit(0 if replay(args.file, args.headless, args.speed) else 1)
+    elif args.command == "sim":
+        sys.exit(run_sim(args.game, args.games, args.workers, args.bot, args.seed or 0, args.max_steps, args.json,
+                         words=args.words, difficulty=args.difficulty, grid_size=args.size, mine_count=args.mines,
+                         width=args.width or args.size, height=args.height or args.size))
+    elif args.command == "serve":
+        serve_battleship(args.host, args.port)
+    elif args.command == "battleship":
+        if use_terminal() and not args.connect:
+            terminal_game("battleship")
+        else:
+            battleship_game(mode="online" if args.connect else None)
+    elif args.command == "minesweeper":
+        size = args.size or 8
+        if args.solve:
+            solve_minesweeper(size, args.mines, args.seed)
+        elif use_terminal():
+            terminal_game("minesweeper", args.seed, grid_size=size, mine_count=args.mines)
+        else:
+            minesweeper_game(args.seed, size, args.mines)
+    elif args.command == "snake":
+        width, height = args.width or args.size or 30, args.height or args.size or 20
+        if use_terminal():
+            terminal_game("snake", args.seed, width=width, height=height)
+        else:
+            snake_game(args.seed, width, height)
+    elif args.run:
+        sys.exit(run_batch(args.run.split(","), args.parallel, args.timeout, args.json))
+    elif args.send:
+        sys.exit(send_bulk(args.send, args.transport, args.outbox, rate=args.rate,
+                           retries=args.retries, concurrency=args.concurrency))
+    elif args.refresh:
         refresh_package()
     elif args.p:
         show_panel()